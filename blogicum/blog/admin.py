@@ -1,12 +1,115 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
 from .models import Post, Category, Location, Comment
+from . import bulk, moderation
+from .forms import BasePostForm
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр с полем ввода вместо списка всех значений.
+
+    Стандартный фильтр по внешнему ключу выводит каждую строку
+    связанной таблицы, что на миллионах публикаций и пользователей
+    делает страницу списка непригодной.
+    """
+
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        # Без вариантов Django не показывает фильтр.
+        return ((None, None),)
+
+    def choices(self, changelist):
+        params = changelist.get_filters_params()
+        params.pop(self.parameter_name, None)
+        yield {
+            'query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            'query_parts': params.items(),
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору (логин)'
+    parameter_name = 'author_username'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value())
+        return queryset
+
+
+class PostIdFilter(InputFilter):
+    title = 'публикации (id)'
+    parameter_name = 'post_id'
+
+    def queryset(self, request, queryset):
+        if self.value() and self.value().isdigit():
+            return queryset.filter(post_id=self.value())
+        return queryset
+
+
+class BulkDeleteMixin:
+    """Удаление выбранных одним набором DELETE вместо delete() на объект."""
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(
+        description='Удалить выбранные %(verbose_name_plural)s',
+        permissions=('delete',)
+    )
+    def bulk_delete(self, request, queryset):
+        deleted, queued = moderation.bulk_delete(queryset)
+        if queued:
+            self.message_user(
+                request,
+                f'Снято с публикации и поставлено в очередь на удаление: '
+                f'{queued}.'
+            )
+        else:
+            self.message_user(request, f'Удалено: {deleted}.')
+
+
+class BulkPublishMixin(BulkDeleteMixin):
+
+    @admin.action(
+        description='Опубликовать выбранные %(verbose_name_plural)s',
+        permissions=('change',)
+    )
+    def bulk_publish(self, request, queryset):
+        rows = bulk.update(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано: {rows}.')
+
+    @admin.action(
+        description='Снять с публикации выбранные %(verbose_name_plural)s',
+        permissions=('change',)
+    )
+    def bulk_unpublish(self, request, queryset):
+        rows = bulk.update(queryset, is_published=False)
+        self.message_user(request, f'Снято с публикации: {rows}.')
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
-    list_display = ("title", "category", "is_published", "pub_date")
-    search_fields = ("title", "text")
-    list_filter = ("is_published", "category", "pub_date")
+class PostAdmin(BulkPublishMixin, admin.ModelAdmin):
+    form = BasePostForm
+    list_display = (
+        "title", "author", "category", "is_published", "pub_date",
+        "view_count"
+    )
+    list_select_related = ("author", "category")
+    # Полный текст хранится сжатым (PostBody) и LIKE по нему не ищет;
+    # по тексту ищем с начала, по несжатому excerpt.
+    search_fields = ("title", "^excerpt", "=author__username")
+    list_filter = ("is_published", "category", AuthorFilter)
+    date_hierarchy = "pub_date"
+    autocomplete_fields = ("author", "category", "location")
+    readonly_fields = ("view_count",)
+    show_full_result_count = False
+    actions = ("bulk_publish", "bulk_unpublish", "bulk_delete")
 
 
 @admin.register(Location)
@@ -17,14 +120,32 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BulkPublishMixin, admin.ModelAdmin):
     list_display = ("title", "is_published")
     search_fields = ("title",)
     list_filter = ("is_published",)
+    actions = ("bulk_publish", "bulk_unpublish", "bulk_delete")
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ("post", "author", "text", "created_at")
-    search_fields = ("text", "author__username", "post__title")
-    list_filter = ("created_at", "post", "author")
+    list_select_related = ("post", "author")
+    # Длинные тексты хранятся сжатыми (CompressedTextField), и LIKE
+    # находит только короткие; об этом сообщается при поиске.
+    search_fields = ("text", "=author__username", "^post__title")
+    list_filter = (PostIdFilter, AuthorFilter)
+    date_hierarchy = "created_at"
+    autocomplete_fields = ("post", "author")
+    show_full_result_count = False
+    actions = ("bulk_delete",)
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term:
+            messages.info(
+                request,
+                'Поиск по тексту находит только комментарии короче '
+                f'{settings.TEXT_COMPRESSION_MIN_SIZE} байт: более '
+                'длинные хранятся сжатыми.'
+            )
+        return super().get_search_results(request, queryset, search_term)
@@ -0,0 +1,226 @@
+"""Массовые UPDATE и DELETE без загрузки объектов в память.
+
+Строки обрабатываются порциями по BULK_CHUNK_SIZE первичных ключей.
+Удаление повторяет правила on_delete внешних ключей так же, как
+Collector, но идёт от листьев: сначала порциями удаляются комментарии
+и тексты публикаций, потом публикации, потом пользователь. В память
+попадает только порция ключей, поэтому расход памяти не зависит от
+числа комментариев. Каждая порция фиксируется отдельной транзакцией:
+прерванное удаление можно просто запустить ещё раз.
+
+Сигналы моделей не отправляются, поэтому кэши сбрасываются одним
+набором событий шины (blog.bus) в конце операции. Файлы удалённых
+строк стираются из хранилища в фоновом потоке после коммита.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, models, transaction
+
+from .bus import bus
+from .models import Category, Comment, Location, Post
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+_file_cleanup = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='bulk-file-cleanup'
+)
+
+
+def chunks(ids):
+    size = settings.BULK_CHUNK_SIZE
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _affected_authors(model, ids):
+    """Авторы, чьи сводки профиля меняются вместе с этими строками."""
+    if model is Post:
+        rows = Post._base_manager.filter(pk__in=ids).values_list('author_id')
+    elif model is Comment:
+        rows = Comment._base_manager.filter(pk__in=ids).values_list(
+            'post__author_id'
+        )
+    elif model is User:
+        rows = Comment._base_manager.filter(author__in=ids).values_list(
+            'post__author_id'
+        )
+    else:
+        return set()
+    return {author_id for author_id, in rows.order_by().distinct()}
+
+
+def _invalidate(model, ids, touched, authors):
+    bus.publish('table', *(
+        touched_model._meta.db_table for touched_model in touched
+    ))
+    for dimension in (Category, Location):
+        if dimension in touched:
+            bus.publish('dimension', dimension._meta.label_lower)
+    if model is User:
+        bus.publish('user', *ids)
+    if authors:
+        bus.publish('profile', *authors)
+
+
+def update(queryset, **values):
+    """UPDATE выборки порциями; возвращает число изменённых строк."""
+    model = queryset.model
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    authors = set()
+    rows = 0
+    for chunk in chunks(ids):
+        authors |= _affected_authors(model, chunk)
+        rows += model._base_manager.filter(pk__in=chunk).update(**values)
+    _invalidate(model, ids, {model}, authors)
+    return rows
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.exception('Не удалось удалить файл %s', name)
+
+
+def _schedule_file_cleanup(queryset):
+    for field in queryset.model._meta.concrete_fields:
+        if not isinstance(field, models.FileField):
+            continue
+        names = [
+            name for name in queryset.values_list(field.attname, flat=True)
+            if name
+        ]
+        if names:
+            transaction.on_commit(partial(
+                _cleanup_unreferenced, queryset.model, field, names
+            ))
+
+
+def _cleanup_unreferenced(model, field, names):
+    # Одинаковые загрузки хранятся одним файлом (ContentAddressedStorage),
+    # он может принадлежать и оставшимся строкам.
+    in_use = set(
+        model._base_manager.filter(**{f'{field.attname}__in': names})
+        .values_list(field.attname, flat=True)
+    )
+    names = [name for name in names if name not in in_use]
+    if names:
+        _file_cleanup.submit(_delete_files, field.storage, names)
+
+
+def _reverse_relations(model):
+    # include_hidden: связи с related_name='+' и промежуточные таблицы
+    # ManyToManyField тоже ссылаются на удаляемые строки.
+    return [
+        field for field in model._meta.get_fields(include_hidden=True)
+        if field.auto_created and not field.concrete
+        and (field.one_to_many or field.one_to_one)
+    ]
+
+
+def _dependents(queryset):
+    """Пары (связь, выборка строк, ссылающихся на строки queryset)."""
+    for relation in _reverse_relations(queryset.model):
+        if relation.on_delete not in (
+                models.CASCADE, models.SET_NULL, models.DO_NOTHING):
+            raise ValueError(
+                f'{relation.related_model.__name__}.{relation.field.name}: '
+                'быстрое удаление не поддерживает это правило on_delete'
+            )
+        if relation.on_delete is not models.DO_NOTHING:
+            yield relation, relation.related_model._base_manager.filter(
+                **{f'{relation.field.name}__in': queryset.values('pk')}
+            )
+
+
+def _chunks_of(queryset):
+    """Порции ключей выборки, которая сокращается после каждой порции."""
+    size = settings.BULK_CHUNK_SIZE
+    while True:
+        ids = list(
+            queryset.order_by().values_list('pk', flat=True)[:size]
+        )
+        if ids:
+            yield ids
+        if len(ids) < size:
+            return
+
+
+def _execute_delete(model, ids):
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {pk} IN ({placeholders})', ids
+        )
+        return cursor.rowcount
+
+
+def _delete_chunk(model, ids, touched):
+    """DELETE строк ids в текущей транзакции.
+
+    Зависимые строки к этому моменту уже удалены; здесь удаляются только
+    появившиеся после этого, обычно их нет.
+    """
+    for relation, related in _dependents(
+            model._base_manager.filter(pk__in=ids)):
+        if relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+            continue
+        related_ids = list(related.values_list('pk', flat=True))
+        if related_ids:
+            _delete_chunk(relation.related_model, related_ids, touched)
+    _schedule_file_cleanup(model._base_manager.filter(pk__in=ids))
+    return _execute_delete(model, ids)
+
+
+def _delete_tree(queryset, touched):
+    """Удаляет строки queryset и всё, что от них зависит, от листьев.
+
+    Сначала порциями удаляются зависимые строки, затем сами строки.
+    Каждая порция — отдельная транзакция верхнего уровня, поэтому
+    блокировка записи не держится на всё удаление, а прерванное
+    удаление продолжается повторным запуском.
+    """
+    model = queryset.model
+    touched.add(model)
+    for relation, related in _dependents(queryset):
+        if relation.on_delete is models.CASCADE:
+            _delete_tree(related, touched)
+            continue
+        touched.add(relation.related_model)
+        for ids in _chunks_of(related):
+            relation.related_model._base_manager.filter(pk__in=ids).update(
+                **{relation.field.name: None}
+            )
+    rows = 0
+    for ids in _chunks_of(queryset):
+        with transaction.atomic():
+            rows += _delete_chunk(model, ids, touched)
+    return rows
+
+
+def delete_ids(model, ids):
+    """Удаляет строки модели по ключам вместе с зависимыми.
+
+    Возвращает число удалённых строк самой модели. Вызывать вне
+    transaction.atomic(), иначе порции не фиксируются по отдельности.
+    """
+    touched = set()
+    authors = set()
+    rows = 0
+    for chunk in chunks(ids):
+        authors |= _affected_authors(model, chunk)
+        rows += _delete_tree(
+            model._base_manager.filter(pk__in=chunk), touched
+        )
+    _invalidate(model, ids, touched, authors)
+    return rows
@@ -0,0 +1,166 @@
+"""Шина сброса кэшей между процессами.
+
+Обработчик темы сбрасывает либо общий для всех процессов кэш
+(shared=True), либо состояние в памяти процесса — словари
+blog.dimensions. publish() выполняет все обработчики сразу в своём
+процессе. Общий кэш сбрасывается только здесь: один раз сейчас и ещё
+раз после коммита, чтобы другой процесс не успел снова положить в кэш
+старые строки. Остальные процессы о таком сбросе не узнают — им не
+нужно. Если у темы есть обработчики памяти процесса, после коммита
+событие записывается в таблицу InvalidationEvent. Остальные процессы
+опрашивают её не чаще раза в INVALIDATION_BUS_POLL_INTERVAL секунд
+(InvalidationBusMiddleware) и выполняют только такие обработчики, так
+что задержка ограничена этим интервалом.
+
+Автоинкрементные id коммитятся не строго по порядку, поэтому события
+моложе INVALIDATION_BUS_GRACE секунд перечитываются при следующих
+опросах; уже применённые пропускаются. Задержка (время опроса минус
+время записи события) копится в metrics и при превышении
+INVALIDATION_BUS_LAG_WARNING пишется в лог; часы узлов должны быть
+синхронизированы.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidationBus:
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._handlers = defaultdict(list)
+        self._lock = threading.Lock()
+        self._low_water = None
+        self._applied = set()
+        self._next_poll = 0.0
+        self.metrics = {
+            'polls': 0,
+            'applied': 0,
+            'last_lag': None,
+            'max_lag': 0.0,
+        }
+
+    def subscribe(self, topic, shared=False):
+        """Декоратор: handler(key) вызывается для каждого события темы.
+
+        shared=True — обработчик сбрасывает общий кэш и выполняется
+        только в процессе, опубликовавшем событие.
+        """
+        def decorator(handler):
+            self._handlers[topic].append((handler, shared))
+            return handler
+        return decorator
+
+    def _apply(self, topic, keys, shared=(True, False)):
+        for handler, handler_shared in self._handlers[topic]:
+            if handler_shared in shared:
+                for key in keys:
+                    handler(key)
+
+    def publish(self, topic, *keys):
+        """Сбрасывает кэши по ключам темы здесь и во всех процессах."""
+        keys = [str(key) for key in keys]
+        self._apply(topic, keys)
+        handlers = self._handlers[topic]
+        if any(shared for _, shared in handlers) \
+                and transaction.get_connection().in_atomic_block:
+            transaction.on_commit(
+                lambda: self._apply(topic, keys, shared=(True,))
+            )
+        if not all(shared for _, shared in handlers):
+            transaction.on_commit(lambda: self._write(topic, keys))
+
+    def _write(self, topic, keys):
+        event_model = apps.get_model('blog', 'InvalidationEvent')
+        event_model.objects.bulk_create(
+            event_model(topic=topic, key=key, origin=self.origin)
+            for key in keys
+        )
+
+    def poll_if_due(self):
+        interval = settings.INVALIDATION_BUS_POLL_INTERVAL
+        if interval is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_poll:
+                return
+            self._next_poll = now + interval
+        try:
+            self.poll()
+        except DatabaseError:
+            logger.exception('Не удалось прочитать шину сброса кэшей')
+
+    def poll(self):
+        """Применяет события других процессов, записанные с прошлого опроса."""
+        event_model = apps.get_model('blog', 'InvalidationEvent')
+        with self._lock:
+            if self._low_water is None:
+                # Локальные кэши нового процесса пусты, история не нужна.
+                self._low_water = event_model.objects.aggregate(
+                    last=Max('id')
+                )['last'] or 0
+                return 0
+            events = list(
+                event_model.objects.filter(id__gt=self._low_water)
+                .order_by('id')
+                .values_list('id', 'topic', 'key', 'origin', 'created_at')
+            )
+            now = timezone.now()
+            applied = 0
+            for pk, topic, key, origin, created_at in events:
+                if pk in self._applied:
+                    continue
+                self._applied.add(pk)
+                if origin == self.origin:
+                    continue
+                self._apply(topic, [key], shared=(False,))
+                applied += 1
+                self._record_lag((now - created_at).total_seconds())
+
+            settled = now - timedelta(
+                seconds=settings.INVALIDATION_BUS_GRACE
+            )
+            for pk, _, _, _, created_at in events:
+                if created_at > settled:
+                    break
+                self._low_water = pk
+            self._applied = {
+                pk for pk in self._applied if pk > self._low_water
+            }
+            self.metrics['polls'] += 1
+            self.metrics['applied'] += applied
+        return applied
+
+    def prune(self):
+        """Удаляет события старше INVALIDATION_BUS_RETENTION секунд."""
+        event_model = apps.get_model('blog', 'InvalidationEvent')
+        deadline = timezone.now() - timedelta(
+            seconds=settings.INVALIDATION_BUS_RETENTION
+        )
+        deleted, _ = event_model.objects.filter(
+            created_at__lt=deadline
+        ).delete()
+        return deleted
+
+    def _record_lag(self, lag):
+        self.metrics['last_lag'] = lag
+        self.metrics['max_lag'] = max(self.metrics['max_lag'], lag)
+        if lag > settings.INVALIDATION_BUS_LAG_WARNING:
+            logger.warning(
+                'Событие шины сброса кэшей применено через %.1f с', lag
+            )
+
+
+bus = InvalidationBus()
@@ -0,0 +1,104 @@
+"""Счётчик просмотров публикаций с отложенной записью в БД.
+
+Просмотры копятся в памяти процесса; фоновый поток раз в
+VIEW_COUNT_FLUSH_INTERVAL секунд записывает их одним UPDATE на порцию
+публикаций, так что запросы пользователей в БД не пишут. Повторный
+просмотр той же публикации в той же сессии в течение
+VIEW_COUNT_DEDUP_WINDOW секунд не считается.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Post
+
+FLUSH_CHUNK_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._flusher = None
+
+    def record(self, post_id, visitor):
+        if visitor is not None and not cache.add(
+                f'post_viewed:{visitor}:{post_id}', True,
+                settings.VIEW_COUNT_DEDUP_WINDOW):
+            return False
+        with self._lock:
+            self._pending[post_id] += 1
+            self._start_flusher()
+        return True
+
+    def pending(self, post_id):
+        return self._pending.get(post_id, 0)
+
+    def reset(self):
+        """Отбрасывает незаписанные просмотры."""
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self):
+        """Записывает накопленные просмотры.
+
+        Если UPDATE не удался, незаписанные приращения возвращаются
+        в буфер и попадут в следующую запись.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        items = list(pending.items())
+        for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+            chunk = items[start:start + FLUSH_CHUNK_SIZE]
+            try:
+                # Мимо CachedQuerySet: счётчик не выводится ни в одном
+                # кэшируемом списке, и сброс версии blog_post раз в минуту
+                # выбрасывал бы все закэшированные ленты и страницы.
+                Post._base_manager.filter(
+                    pk__in=[pk for pk, _ in chunk]
+                ).update(
+                    view_count=F('view_count') + Case(
+                        *(When(pk=pk, then=Value(delta))
+                          for pk, delta in chunk),
+                        output_field=IntegerField()
+                    )
+                )
+            except Exception:
+                with self._lock:
+                    self._pending.update(dict(items[start:]))
+                raise
+
+    def _start_flusher(self):
+        interval = settings.VIEW_COUNT_FLUSH_INTERVAL
+        if interval is None or self._flusher is not None:
+            return
+        self._flusher = threading.Thread(
+            target=self._run_flusher, args=(interval,),
+            name='view-counter-flush', daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Не удалось записать просмотры публикаций')
+            finally:
+                # Соединения этого потока: между записями они не нужны.
+                connections.close_all()
+
+
+post_views = ViewCounter()
+atexit.register(post_views.flush)
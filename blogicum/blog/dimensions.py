@@ -0,0 +1,59 @@
+"""Категории и локации в памяти процесса.
+
+Таблицы маленькие, а нужны почти каждой карточке публикации, поэтому
+лента получает их из словаря вместо JOIN. Актуальность проверяется по
+номеру версии в общем кэше: сигналы меняют его при изменении таблицы,
+и каждый процесс перечитывает её при следующем обращении. Событие шины
+(blog.bus) вдобавок сбрасывает словари всех процессов.
+"""
+from django.core.cache import cache
+
+from .models import Category, Location
+from .querycache import new_version
+
+
+class DimensionCache:
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f'dimension_version:{model._meta.label_lower}'
+        self._state = (None, {})
+
+    def current_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # После вытеснения ключа версия не должна совпасть ни с одной
+            # из тех, что уже видели процессы.
+            cache.add(self.version_key, new_version())
+            version = cache.get(self.version_key)
+        return version
+
+    def get_map(self):
+        version = self.current_version()
+        loaded_version, objects = self._state
+        if version is None or version != loaded_version:
+            objects = {obj.pk: obj for obj in self.model.objects.all()}
+            self._state = (version, objects)
+        return objects
+
+    def invalidate(self):
+        cache.set(self.version_key, new_version())
+
+    def forget(self):
+        self._state = (None, {})
+
+
+categories = DimensionCache(Category)
+locations = DimensionCache(Location)
+
+
+def attach_dimensions(posts):
+    """Проставляет публикациям категории и локации из памяти процесса."""
+    category_map = categories.get_map()
+    location_map = locations.get_map()
+    for post in posts:
+        if post.category_id in category_map:
+            post.category = category_map[post.category_id]
+        if post.location_id in location_map:
+            post.location = location_map[post.location_id]
+    return posts
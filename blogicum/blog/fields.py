@@ -0,0 +1,53 @@
+"""Поля моделей блога."""
+import base64
+import zlib
+
+from django.conf import settings
+from django.db import models
+
+COMPRESSED_PREFIX = '\x01zlib:'
+
+
+def compress_text(text):
+    """Значение для записи в БД: zlib в base64 с префиксом или как есть.
+
+    Текст, который сам начинается с префикса, сжимается всегда, чтобы
+    при чтении его нельзя было спутать со сжатым.
+    """
+    data = text.encode()
+    forced = text.startswith(COMPRESSED_PREFIX)
+    if len(data) < settings.TEXT_COMPRESSION_MIN_SIZE and not forced:
+        return text
+    compressed = COMPRESSED_PREFIX + base64.b64encode(
+        zlib.compress(data, settings.TEXT_COMPRESSION_LEVEL)
+    ).decode('ascii')
+    return compressed if forced or len(compressed) < len(data) else text
+
+
+def decompress_text(value):
+    if not value.startswith(COMPRESSED_PREFIX):
+        return value
+    return zlib.decompress(
+        base64.b64decode(value[len(COMPRESSED_PREFIX):])
+    ).decode()
+
+
+class CompressedTextField(models.TextField):
+    """TextField, который хранит длинные значения сжатыми.
+
+    Столбец остаётся текстовым, поэтому строки, записанные до сжатия,
+    читаются как есть. Сжимается только записываемое значение, параметры
+    поиска идут как есть: LIKE (icontains и т. п.) и точное сравнение
+    находят только несжатые, то есть короткие, значения.
+    """
+
+    def get_db_prep_save(self, value, connection):
+        value = super().get_db_prep_save(value, connection)
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -2,7 +2,23 @@ from django import forms
 from .models import Post, Comment
 
 
-class PostForm(forms.ModelForm):
+class BasePostForm(forms.ModelForm):
+    """Форма публикации с полем text, хранящимся в PostBody."""
+
+    text = forms.CharField(label='Текст', widget=forms.Textarea)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault('text', self.instance.text)
+
+    def _post_clean(self):
+        super()._post_clean()
+        if 'text' in self.cleaned_data:
+            self.instance.text = self.cleaned_data['text']
+
+
+class PostForm(BasePostForm):
     class Meta:
         model = Post
         fields = ['title', 'category', 'location',
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.bus import bus
+from blog.models import TEXT_STATS_FIELDS, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает начало текста, число слов и время чтения '
+        'публикаций порциями. Нужен после добавления полей и после '
+        'изменения EXCERPT_WORDS или READING_WORDS_PER_MINUTE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post._base_manager.filter(pk__gt=last_pk)
+                .select_related('body')
+                .order_by('pk')
+                .only('pk', 'body__text')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for post in batch:
+                post.update_text_stats()
+            updated += Post._base_manager.bulk_update(
+                batch, TEXT_STATS_FIELDS
+            ) or len(batch)
+        bus.publish('table', Post._meta.db_table)
+        self.stdout.write(
+            f'Обновлено публикаций: {updated} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+# Замены стандартных middleware, которые делают проект.
+STOCK_MIDDLEWARE = {
+    'blog.middleware.AnonymousFastSessionMiddleware':
+        'django.contrib.sessions.middleware.SessionMiddleware',
+    'blog.middleware.CachedAuthenticationMiddleware':
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время анонимных GET-запросов со стандартными '
+        'middleware и с быстрым путём для анонимного чтения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--url', action='append', dest='urls',
+            help='По умолчанию главная и «О проекте».'
+        )
+
+    def handle(self, *args, **options):
+        urls = options['urls'] or [
+            reverse('blog:index'), reverse('pages:about')
+        ]
+        stock = [STOCK_MIDDLEWARE.get(m, m) for m in settings.MIDDLEWARE]
+        for url in urls:
+            for label, middleware in (
+                ('stock', stock), ('fast path', settings.MIDDLEWARE)
+            ):
+                per_request, vary = self.measure(
+                    url, middleware, options['requests']
+                )
+                self.stdout.write(
+                    f'{url:<24} {label:<10} '
+                    f'{per_request * 1000:8.3f} ms/запрос  '
+                    f'Vary: {vary or "-"}'
+                )
+
+    def measure(self, url, middleware, count):
+        with override_settings(MIDDLEWARE=middleware, DEBUG=False):
+            client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+            response = client.get(url)
+            started = time.perf_counter()
+            for _ in range(count):
+                client.get(url)
+            elapsed = time.perf_counter() - started
+        return elapsed / count, response.get('Vary')
@@ -0,0 +1,84 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+from blogicum import compression
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_LEVELS = (1, 4, 5, 6, 9, 11)
+
+
+class Command(BaseCommand):
+    help = (
+        'Размер и время минификации и сжатия сгенерированной ленты '
+        'при разных уровнях gzip и brotli.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        html = self.render_feed(options['posts']).encode()
+        repeat = options['repeat']
+        minified, minify_time = self.measure(
+            lambda: compression.minify_html(html.decode()).encode(), repeat
+        )
+        self.report('исходный HTML', html, len(html), 0)
+        self.report('минификация', html, len(minified), minify_time)
+
+        encodings = [('gzip', GZIP_LEVELS)]
+        if compression.brotli is not None:
+            encodings.append(('br', BROTLI_LEVELS))
+        else:
+            self.stdout.write('brotli не установлен, пропускаем.')
+        for encoding, levels in encodings:
+            for level in levels:
+                compressed, spent = self.measure(
+                    lambda: compression.compress_bytes(
+                        minified, encoding, level
+                    ),
+                    repeat
+                )
+                self.report(
+                    f'{encoding} {level}', html, len(compressed), spent
+                )
+
+    def report(self, label, html, size, spent):
+        self.stdout.write(
+            f'{label:<16} {size:>9} байт  {size / len(html):6.1%}  '
+            f'{spent * 1000:8.3f} мс'
+        )
+
+    @staticmethod
+    def measure(func, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = func()
+        return result, (time.perf_counter() - started) / repeat
+
+    @staticmethod
+    def render_feed(count):
+        author = get_user_model()(username='author')
+        category = Category(title='Путешествия', slug='travel')
+        location = Location(name='Остров отчаянья')
+        posts = []
+        for number in range(count):
+            post = Post(
+                id=number + 1, title=f'Публикация {number}',
+                text='Текст публикации. ' * 200, author=author,
+                category=category, location=location,
+                pub_date=timezone.now(),
+            )
+            post.comment_count = number
+            posts.append(post)
+        page = Paginator(posts, count).page(1)
+        return render_to_string(
+            'blog/index.html', {'page_obj': page, 'user': AnonymousUser()}
+        )
@@ -0,0 +1,95 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.bulk import delete_ids
+from blog.models import Category, Comment, Post, PostBody
+
+INSERT_BATCH = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает удаление пользователя с публикациями и комментариями '
+        'через Collector (user.delete()) и через blog.bulk. '
+        'Данные записываются в БД проекта и удаляются так же, как в '
+        'работе: blog.bulk — с коммитом каждой порции, поэтому лучше '
+        'запускать на копии БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument(
+            '--skip-collector', action='store_true',
+            help='Не запускать медленный вариант через Collector.'
+        )
+        parser.add_argument(
+            '--trace-memory', action='store_true',
+            help='Измерить пик памяти через tracemalloc; замедляет оба '
+                 'варианта, поэтому время при этом несравнимо с обычным.'
+        )
+
+    def handle(self, *args, **options):
+        variants = [('blog.bulk', self.fast_delete)]
+        if not options['skip_collector']:
+            variants.insert(0, ('Collector', lambda user: user.delete()))
+        trace_memory = options['trace_memory']
+        for label, delete in variants:
+            user, category = self.populate(
+                options['posts'], options['comments']
+            )
+            try:
+                if trace_memory:
+                    tracemalloc.start()
+                started = time.perf_counter()
+                delete(user)
+                elapsed = time.perf_counter() - started
+                if trace_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+            finally:
+                # Остатки прерванного удаления, затем категория.
+                self.fast_delete(user)
+                category.delete()
+            line = f'{label:<10} {elapsed:8.2f} с'
+            if trace_memory:
+                line += f'  пик памяти {peak / 1024 / 1024:8.1f} МБ'
+            self.stdout.write(line)
+
+    @staticmethod
+    def fast_delete(user):
+        delete_ids(get_user_model(), [user.pk])
+
+    @staticmethod
+    def populate(post_count, comment_count):
+        User = get_user_model()
+        now = timezone.now()
+        user = User.objects.create(username=f'bench-delete-{time.time_ns()}')
+        category = Category.objects.create(
+            title='bench', description='bench',
+            slug=f'bench-delete-{time.time_ns()}'
+        )
+        Post.objects.bulk_create((
+            Post(author=user, category=category, title=f'Пост {i}',
+                 pub_date=now)
+            for i in range(post_count)
+        ), batch_size=INSERT_BATCH)
+        post_ids = list(
+            Post.objects.filter(author=user).values_list('pk', flat=True)
+        )
+        PostBody.objects.bulk_create((
+            PostBody(post_id=post_id, text='Текст') for post_id in post_ids
+        ), batch_size=INSERT_BATCH)
+        for start in range(0, comment_count, INSERT_BATCH):
+            Comment.objects.bulk_create(
+                Comment(
+                    post_id=post_ids[i % len(post_ids)], author=user,
+                    text='Комментарий'
+                )
+                for i in range(start, min(start + INSERT_BATCH, comment_count))
+            )
+        return user, category
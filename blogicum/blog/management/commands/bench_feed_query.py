@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+# Столбцы ленты идут после text, как в blog_post до выноса текста:
+# поля, добавленные миграциями, SQLite дописывает в конец записи.
+WIDE_SCHEMA = '''
+    CREATE TABLE post (
+        id INTEGER PRIMARY KEY, title TEXT, text TEXT,
+        category_id INTEGER, is_published INTEGER, pub_date TEXT,
+        excerpt TEXT, reading_time INTEGER
+    );
+    CREATE INDEX post_feed ON post (is_published, pub_date);
+'''
+NARROW_SCHEMA = '''
+    CREATE TABLE post (
+        id INTEGER PRIMARY KEY, title TEXT,
+        category_id INTEGER, is_published INTEGER, pub_date TEXT,
+        excerpt TEXT, reading_time INTEGER
+    );
+    CREATE INDEX post_feed ON post (is_published, pub_date);
+    CREATE TABLE postbody (post_id INTEGER PRIMARY KEY, text TEXT);
+'''
+FEED_QUERY = '''
+    SELECT id, title, category_id, pub_date, excerpt, reading_time
+    FROM post WHERE is_published = 1 AND category_id = ?
+    ORDER BY pub_date DESC LIMIT 10 OFFSET ?
+'''
+COUNT_QUERY = '''
+    SELECT COUNT(*) FROM post WHERE is_published = 1 AND category_id = ?
+'''
+CATEGORIES = 10
+INSERT_BATCH = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Время запросов ленты, когда текст публикаций хранится в blog_post '
+        'и когда он вынесен в отдельную таблицу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20000)
+        parser.add_argument('--text-size', type=int, default=8000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, label, schema in (
+                ('wide', 'текст в post', WIDE_SCHEMA),
+                ('narrow', 'текст в postbody', NARROW_SCHEMA),
+            ):
+                path = os.path.join(directory, f'{name}.sqlite3')
+                self.populate(
+                    path, schema, options['posts'], options['text_size']
+                )
+                feed = self.measure(
+                    path, FEED_QUERY, options['repeat'],
+                    lambda i: (i % CATEGORIES, i * 10 % 500)
+                )
+                count = self.measure(
+                    path, COUNT_QUERY, options['repeat'],
+                    lambda i: (i % CATEGORIES,)
+                )
+                self.stdout.write(
+                    f'{label:<18} страница {feed * 1000:8.2f} мс  '
+                    f'COUNT {count * 1000:8.2f} мс  '
+                    f'файл {os.path.getsize(path) / 2 ** 20:7.1f} МБ'
+                )
+
+    @staticmethod
+    def populate(path, schema, posts, text_size):
+        text = ('Текст публикации. ' * (text_size // 18 + 1))[:text_size]
+        with sqlite3.connect(path) as connection:
+            connection.executescript(schema)
+            wide = 'postbody' not in schema
+            for start in range(0, posts, INSERT_BATCH):
+                ids = range(start + 1, min(start + INSERT_BATCH, posts) + 1)
+                if wide:
+                    connection.executemany(
+                        'INSERT INTO post VALUES (?, ?, ?, ?, 1, ?, ?, 1)',
+                        ((i, f'Пост {i}', text, i % CATEGORIES,
+                          f'{i:010d}', text[:100]) for i in ids)
+                    )
+                else:
+                    connection.executemany(
+                        'INSERT INTO post VALUES (?, ?, ?, 1, ?, ?, 1)',
+                        ((i, f'Пост {i}', i % CATEGORIES,
+                          f'{i:010d}', text[:100]) for i in ids)
+                    )
+                    connection.executemany(
+                        'INSERT INTO postbody VALUES (?, ?)',
+                        ((i, text) for i in ids)
+                    )
+        connection.close()
+
+    @staticmethod
+    def measure(path, query, repeat, params):
+        spent = 0
+        for i in range(repeat):
+            # Новое соединение: без кэша страниц SQLite от прошлых запусков.
+            connection = sqlite3.connect(path)
+            started = time.perf_counter()
+            connection.execute(query, params(i)).fetchall()
+            spent += time.perf_counter() - started
+            connection.close()
+        return spent / repeat
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+
+from blogicum.serve import serve_media
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность отдачи медиафайла через '
+        'django.views.static.serve и blogicum.serve.serve_media.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=50)
+
+    def handle(self, *args, **options):
+        size = options['size_mb'] * 1024 * 1024
+        count = options['requests']
+        factory = RequestFactory()
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root):
+            with open(os.path.join(media_root, 'bench.jpg'), 'wb') as f:
+                f.write(os.urandom(size))
+            views = (
+                ('static.serve', lambda request: serve(
+                    request, 'bench.jpg', document_root=media_root
+                ), {}),
+                ('serve_media', lambda request: serve_media(
+                    request, 'bench.jpg'
+                ), {}),
+                ('serve_media range 1MB', lambda request: serve_media(
+                    request, 'bench.jpg'
+                ), {'HTTP_RANGE': 'bytes=0-1048575'}),
+                ('serve_media x-accel', self.accel, {}),
+            )
+            for label, view, headers in views:
+                started = time.perf_counter()
+                sent = 0
+                for _ in range(count):
+                    response = view(factory.get('/media/bench.jpg', **headers))
+                    sent += self.consume(response)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{label:<24} {count / elapsed:10.1f} запросов/с  '
+                    f'{sent / elapsed / 1024 / 1024:10.1f} МБ/с в Python'
+                )
+
+    @staticmethod
+    def accel(request):
+        with override_settings(MEDIA_ACCEL_REDIRECT='x-accel-redirect'):
+            return serve_media(request, 'bench.jpg')
+
+    @staticmethod
+    def consume(response):
+        if not response.streaming:
+            return len(response.content)
+        sent = sum(len(chunk) for chunk in response.streaming_content)
+        response.close()
+        return sent
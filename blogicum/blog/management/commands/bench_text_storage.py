@@ -0,0 +1,101 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.lorem_ipsum import words
+
+from blog.fields import compress_text, decompress_text
+from blog.rendering import RENDERER_VERSION, render_text
+
+INSERT_BATCH = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Размер БД, оценка доли текстов в кэше страниц SQLite и стоимость '
+        'чтения при хранении текстов публикаций и их HTML как есть и '
+        'сжатыми '
+        '(blog.fields.CompressedTextField). Столбцы — как у blog_postbody.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--words', type=int, default=4000)
+        parser.add_argument('--cache-mb', type=int, default=16)
+        parser.add_argument('--reads', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        texts = [
+            words(options['words'], common=False)
+            for _ in range(min(options['posts'], 50))
+        ]
+        bodies = [(text, render_text(text)) for text in texts]
+        posts = options['posts']
+        cache_bytes = options['cache_mb'] * 2 ** 20
+        # Одинаковая последовательность чтений для обоих вариантов.
+        reads = [random.randint(1, posts) for _ in range(options['reads'])]
+        with tempfile.TemporaryDirectory() as directory:
+            for label, encode, decode in (
+                ('как есть', str, str),
+                ('zlib', compress_text, decompress_text),
+            ):
+                path = os.path.join(directory, f'{encode.__name__}.sqlite3')
+                self.populate(path, posts, bodies, encode)
+                size = os.path.getsize(path)
+                read_time, decode_time = self.measure(
+                    path, reads, decode, options['cache_mb']
+                )
+                # sqlite3 не отдаёт счётчики кэша (sqlite3_db_status),
+                # поэтому доля попаданий оценивается для равномерного
+                # доступа: какая часть текстов помещается в кэш.
+                hit_rate = min(1, cache_bytes / size)
+                self.stdout.write(
+                    f'{label:<9} файл {size / 2 ** 20:7.1f} МБ  '
+                    f'в кэше (оценка) {hit_rate:6.1%}  '
+                    f'чтение {read_time * 1e6:8.1f} мкс  '
+                    f'декодирование {decode_time * 1e6:7.1f} мкс'
+                )
+
+    @staticmethod
+    def populate(path, posts, bodies, encode):
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                'CREATE TABLE postbody (post_id INTEGER PRIMARY KEY, '
+                'text, html, renderer_version INTEGER)'
+            )
+            encoded = [
+                (encode(text), encode(html)) for text, html in bodies
+            ]
+            for start in range(0, posts, INSERT_BATCH):
+                connection.executemany(
+                    'INSERT INTO postbody VALUES (?, ?, ?, ?)',
+                    ((i, *encoded[i % len(encoded)], RENDERER_VERSION)
+                     for i in range(
+                        start + 1, min(start + INSERT_BATCH, posts) + 1
+                    ))
+                )
+        connection.close()
+
+    @staticmethod
+    def measure(path, reads, decode, cache_mb):
+        connection = sqlite3.connect(path)
+        connection.execute(f'PRAGMA cache_size = -{cache_mb * 1024}')
+        read_time = decode_time = 0
+        for post_id in reads:
+            started = time.perf_counter()
+            # Страница публикации загружает строку целиком.
+            text, html, _ = connection.execute(
+                'SELECT text, html, renderer_version FROM postbody '
+                'WHERE post_id = ?', (post_id,)
+            ).fetchone()
+            read_time += time.perf_counter() - started
+            started = time.perf_counter()
+            decode(text)
+            decode(html)
+            decode_time += time.perf_counter() - started
+        connection.close()
+        return read_time / len(reads), decode_time / len(reads)
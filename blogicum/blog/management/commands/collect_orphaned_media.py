@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.media_gc import collect
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет медиафайлы, на которые не ссылается ни одна строка БД. '
+        'Запускается по расписанию, например раз в сутки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--quarantine', action='store_true',
+            help='Переносить файлы в MEDIA_GC_QUARANTINE вместо удаления.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, сколько места освободится.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        report = collect(
+            quarantine=options['quarantine'], dry_run=options['dry_run']
+        )
+        action = 'найдено' if options['dry_run'] else (
+            'перенесено в карантин' if options['quarantine'] else 'удалено'
+        )
+        self.stdout.write(
+            f'Проверено файлов: {report.scanned}, {action}: '
+            f'{report.orphans} ({report.reclaimed_bytes / 1024 / 1024:.1f} '
+            f'МБ) за {time.perf_counter() - started:.2f} с'
+        )
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.popularity import rebuild_popular_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг популярных публикаций. '
+        'Запускается по расписанию, например раз в 5 минут.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = rebuild_popular_posts()
+        self.stdout.write(
+            f'Записано строк рейтинга: {rows} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.bulk import delete_ids
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет пользователя со всеми публикациями и комментариями '
+        'порциями, не загружая их в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('Пользователь не найден')
+        delete_ids(User, [user.pk])
+        self.stdout.write(f'Пользователь {user.username} удалён')
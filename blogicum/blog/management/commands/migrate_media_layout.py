@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.bus import bus
+from blog.models import Post
+from blogicum.storage import is_content_addressed
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит изображения публикаций в раскладку по хэшу '
+        'содержимого (post_images/ab/cd/<sha256>.jpg) порциями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--keep-old', action='store_true',
+            help='Не удалять файлы по старым путям.'
+        )
+
+    def handle(self, *args, **options):
+        storage = Post._meta.get_field('image').storage
+        started = time.perf_counter()
+        moved = missing = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post._base_manager.filter(pk__gt=last_pk)
+                .exclude(image='')
+                .order_by('pk')
+                .only('pk', 'image')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changed, old_names = [], set()
+            for post in batch:
+                old_name = post.image.name
+                if is_content_addressed(old_name):
+                    continue
+                if not storage.exists(old_name):
+                    missing += 1
+                    continue
+                with storage.open(old_name) as source:
+                    post.image.name = storage.save(old_name, source)
+                changed.append(post)
+                old_names.add(old_name)
+            if not changed:
+                continue
+            with transaction.atomic():
+                Post._base_manager.bulk_update(changed, ['image'])
+            moved += len(changed)
+            if not options['keep_old']:
+                self.delete_unreferenced(storage, old_names)
+        if moved:
+            bus.publish('table', Post._meta.db_table)
+        self.stdout.write(
+            f'Перенесено: {moved}, файлов не найдено: {missing} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
+
+    @staticmethod
+    def delete_unreferenced(storage, names):
+        in_use = set(
+            Post._base_manager.filter(image__in=names)
+            .values_list('image', flat=True)
+        )
+        for name in names - in_use:
+            storage.delete(name)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.bus import bus
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет старые события шины сброса кэшей. '
+        'Запускается по расписанию, например раз в час.'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Удалено событий: {bus.prune()}')
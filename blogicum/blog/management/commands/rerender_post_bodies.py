@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import TextField, Value
+from django.db.models.functions import Cast
+
+from blog.fields import decompress_text
+from blog.models import PostBody
+from blog.rendering import RENDERER_VERSION, render_text
+
+
+class Command(BaseCommand):
+    help = (
+        'Заново строит HTML текстов публикаций, сохранённый прошлой '
+        'версией рендера. Запускается после изменения blog.rendering; '
+        'до этого такие страницы рендерятся при каждом просмотре. '
+        'Строка, текст которой изменился после чтения, не перезаписывается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перестроить и строки с текущей версией.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        bodies = PostBody.objects.all()
+        if not options['all']:
+            bodies = bodies.exclude(renderer_version=RENDERER_VERSION)
+        # Значение столбца как есть, без распаковки: по нему запись
+        # сравнивается с прочитанной, даже если настройки сжатия менялись.
+        stored_text = Cast('text', TextField())
+        updated = skipped = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                bodies.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', stored_text)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            rendered = [
+                (pk, stored, render_text(decompress_text(stored)))
+                for pk, stored in batch
+            ]
+            with transaction.atomic():
+                for pk, stored, html in rendered:
+                    # Запись не состоится, если публикацию успели
+                    # отредактировать: её save() уже построил HTML.
+                    written = PostBody.objects.filter(
+                        pk=pk, text=Value(stored, output_field=TextField())
+                    ).update(html=html, renderer_version=RENDERER_VERSION)
+                    updated += written
+                    skipped += 1 - written
+        self.stdout.write(
+            f'Перестроено текстов: {updated} (версия {RENDERER_VERSION}), '
+            f'изменённых во время работы: {skipped}, '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.moderation import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет массовые удаления, поставленные в очередь из админки. '
+        'Запускается по расписанию, например раз в минуту.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = run_pending_jobs()
+        self.stdout.write(
+            f'Удалено строк: {rows} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
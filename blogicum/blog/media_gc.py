@@ -0,0 +1,101 @@
+"""Сборщик медиафайлов, на которые не ссылается ни одна строка.
+
+Замена изображения при редактировании публикации оставляет старый файл
+в хранилище, а удаление файлов после blog.bulk может не случиться, если
+процесс завершится раньше фонового потока. Сборщик читает все значения
+файловых полей одним потоковым запросом на поле в множество, обходит
+каталоги upload_to через os.scandir без построения полного списка и
+сверяет каждый файл с множеством. Файлы моложе MEDIA_GC_GRACE_PERIOD
+не трогаются: загрузка могла записать файл до коммита строки.
+"""
+import os
+import shutil
+import time
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+
+SCAN_CHUNK_SIZE = 2000
+
+
+@dataclass
+class Report:
+    scanned: int = 0
+    orphans: int = 0
+    reclaimed_bytes: int = 0
+
+
+def _file_fields():
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+def referenced_names():
+    names = set()
+    for model, field in _file_fields():
+        names.update(
+            model._base_manager.exclude(**{field.attname: ''})
+            .values_list(field.attname, flat=True)
+            .iterator(chunk_size=SCAN_CHUNK_SIZE)
+        )
+    return names
+
+
+def upload_dirs():
+    # upload_to-функции дают произвольные пути, такие каталоги не
+    # обходятся.
+    return sorted({
+        field.upload_to.strip('/') for _, field in _file_fields()
+        if isinstance(field.upload_to, str) and field.upload_to.strip('/')
+    })
+
+
+def _walk(path):
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def find_orphans(media_root, referenced, older_than, report):
+    """Файлы каталогов upload_to без ссылок и старше older_than."""
+    for directory in upload_dirs():
+        root = os.path.join(media_root, directory)
+        if not os.path.isdir(root):
+            continue
+        for entry in _walk(root):
+            report.scanned += 1
+            name = os.path.relpath(entry.path, media_root).replace(
+                os.sep, '/'
+            )
+            if name in referenced:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime < older_than:
+                yield name, entry.path, stat.st_size
+
+
+def collect(quarantine=False, dry_run=False):
+    """Удаляет или переносит в MEDIA_GC_QUARANTINE осиротевшие файлы."""
+    media_root = str(settings.MEDIA_ROOT)
+    older_than = time.time() - settings.MEDIA_GC_GRACE_PERIOD
+    report = Report()
+    for name, path, size in find_orphans(
+            media_root, referenced_names(), older_than, report):
+        report.orphans += 1
+        report.reclaimed_bytes += size
+        if dry_run:
+            continue
+        if quarantine:
+            target = os.path.join(str(settings.MEDIA_GC_QUARANTINE), name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(path, target)
+        else:
+            os.remove(path)
+    return report
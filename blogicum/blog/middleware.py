@@ -0,0 +1,205 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import constant_time_compare
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+
+from blogicum import compression
+from blogicum.serve import accepted_encodings
+
+from .bus import bus
+
+USER_CACHE_KEY = 'auth_user:{}'
+# Пароль не кэшируется: поле остаётся отложенным и загружается
+# только при смене пароля.
+USER_CACHE_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email',
+    'is_staff', 'is_superuser', 'is_active', 'date_joined', 'last_login',
+)
+
+
+def _cached_field_names():
+    # from_db() ожидает значения в порядке полей модели.
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.attname in USER_CACHE_FIELDS
+    ]
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+def get_cached_user(request):
+    """Пользователь сессии из кэша, при промахе — из БД."""
+    user_id = request.session.get(SESSION_KEY)
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if user_id is not None and session_hash:
+        data = cache.get(USER_CACHE_KEY.format(user_id))
+        if data and constant_time_compare(
+                data['session_hash'], session_hash):
+            return get_user_model().from_db(
+                DEFAULT_DB_ALIAS, _cached_field_names(), data['values']
+            )
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(
+            USER_CACHE_KEY.format(user.pk),
+            {
+                'session_hash': user.get_session_auth_hash(),
+                'values': [
+                    getattr(user, name) for name in _cached_field_names()
+                ],
+            },
+            settings.AUTH_USER_CACHE_TIMEOUT
+        )
+    return user
+
+
+class InvalidationBusMiddleware:
+    """Перед запросом применяет события сброса кэшей других процессов."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        bus.poll_if_due()
+        return self.get_response(request)
+
+
+def is_anonymous_read(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+class AnonymousFastSessionMiddleware(SessionMiddleware):
+    """SessionMiddleware с быстрым путём для анонимного чтения.
+
+    У запроса без сессионной cookie сессия заведомо пуста, поэтому
+    ответ не зависит от неё: его не нужно сохранять и помечать
+    Vary: Cookie. Такие ответы можно отдавать из общего кэша, если
+    прокси пропускает мимо кэша запросы с сессионной cookie.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.anonymous_read = is_anonymous_read(request)
+
+    def process_response(self, request, response):
+        if not getattr(request, 'anonymous_read', False) \
+                or request.session.modified:
+            return super().process_response(request, response)
+        if (
+            settings.ANONYMOUS_CACHE_MAX_AGE
+            and response.status_code == 200
+            and not response.cookies
+            and not response.has_header('Cache-Control')
+        ):
+            patch_cache_control(
+                response, public=True,
+                max_age=settings.ANONYMOUS_CACHE_MAX_AGE
+            )
+        return response
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware, читающий пользователя через кэш."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        if getattr(request, 'anonymous_read', False):
+            request.user = AnonymousUser()
+            return
+        request.user = SimpleLazyObject(lambda: _get_user(request))
+
+
+def _get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_cached_user(request)
+    return request._cached_user
+
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'image/svg+xml',
+)
+# Короткие ответы сжатие почти не уменьшает.
+MIN_COMPRESS_SIZE = 200
+
+
+class MinifyCompressMiddleware:
+    """Схлопывает пробелы в HTML и сжимает ответ brotli или gzip.
+
+    Работает и с обычными, и с потоковыми ответами. Уровни сжатия
+    задаются RESPONSE_COMPRESSION_LEVELS, см. bench_compression.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '')
+        if response.has_header('Content-Encoding') \
+                or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if content_type.startswith('text/html') and settings.MINIFY_HTML:
+            self.minify(response)
+        if not response.streaming \
+                and len(response.content) < MIN_COMPRESS_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+        level = settings.RESPONSE_COMPRESSION_LEVELS[encoding]
+        if response.streaming:
+            response.streaming_content = compression.compress_sequence(
+                response.streaming_content, encoding, level
+            )
+            del response['Content-Length']
+        else:
+            compressed = compression.compress_bytes(
+                response.content, encoding, level
+            )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def minify(response):
+        if response.streaming:
+            response.streaming_content = compression.minify_html_sequence(
+                response.streaming_content, response.charset
+            )
+            del response['Content-Length']
+            return
+        response.content = compression.minify_html(
+            response.content.decode(response.charset)
+        ).encode(response.charset)
+        response['Content-Length'] = str(len(response.content))
+
+    @staticmethod
+    def choose_encoding(request):
+        accepted = accepted_encodings(request)
+        if 'br' in accepted and compression.brotli is not None:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
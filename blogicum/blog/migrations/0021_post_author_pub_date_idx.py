@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-19 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_alter_post_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-pub_date'], name='post_author_pub_date_idx'),
+        ),
+    ]
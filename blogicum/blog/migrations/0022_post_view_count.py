@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0021_post_author_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Просмотров'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-19 07:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0022_post_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('score', models.FloatField(verbose_name='Оценка')),
+                ('computed_at', models.DateTimeField(verbose_name='Рассчитано')),
+                ('category', models.ForeignKey(help_text='Пусто — общий рейтинг.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category', verbose_name='Категория')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'популярная публикация',
+                'verbose_name_plural': 'Популярные публикации',
+                'ordering': ('category', 'rank'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='popularpost',
+            index=models.Index(fields=['category', 'rank'], name='popular_category_rank_idx'),
+        ),
+    ]
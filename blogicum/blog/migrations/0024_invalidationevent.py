@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0023_popularpost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvalidationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=32, verbose_name='Тема')),
+                ('key', models.CharField(max_length=256, verbose_name='Ключ')),
+                ('origin', models.CharField(max_length=32, verbose_name='Процесс-источник')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Записано')),
+            ],
+            options={
+                'verbose_name': 'событие сброса кэша',
+                'verbose_name_plural': 'События сброса кэша',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0024_invalidationevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=64, verbose_name='Модель')),
+                ('object_ids', models.JSONField(verbose_name='Первичные ключи')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Поставлено')),
+            ],
+            options={
+                'verbose_name': 'задание модерации',
+                'verbose_name_plural': 'Задания модерации',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0025_moderationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=256, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Слов'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def copy_text_to_bodies(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostBody = apps.get_model('blog', 'PostBody')
+    last_pk = 0
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', 'text')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        PostBody.objects.bulk_create(
+            PostBody(post_id=pk, text=text) for pk, text in batch
+        )
+
+
+def copy_bodies_to_text(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostBody = apps.get_model('blog', 'PostBody')
+    for post_id, text in PostBody.objects.values_list(
+            'post_id', 'text').iterator(chunk_size=BATCH_SIZE):
+        Post.objects.filter(pk=post_id).update(text=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0026_post_text_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostBody',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('text', models.TextField(verbose_name='Текст')),
+            ],
+            options={
+                'verbose_name': 'текст публикации',
+                'verbose_name_plural': 'Тексты публикаций',
+            },
+        ),
+        migrations.RunPython(copy_text_to_bodies, copy_bodies_to_text),
+        # Значение по умолчанию нужно только для отката: колонка
+        # возвращается в таблицу с уже существующими строками.
+        migrations.AlterField(
+            model_name='post',
+            name='text',
+            field=models.TextField(default='', verbose_name='Текст'),
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='text',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0027_postbody'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postbody',
+            name='html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML'),
+        ),
+        migrations.AddField(
+            model_name='postbody',
+            name='renderer_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Версия рендера'),
+        ),
+    ]
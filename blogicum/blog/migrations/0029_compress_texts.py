@@ -0,0 +1,79 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:23
+
+import blog.fields
+from django.db import migrations
+
+BATCH_SIZE = 1000
+FIELDS = {
+    'Comment': ('text',),
+    'PostBody': ('text', 'html'),
+}
+
+
+def _batches(model, fields):
+    last_pk = 0
+    while True:
+        batch = list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('pk', *fields)[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        yield batch
+
+
+def compress_texts(apps, schema_editor):
+    # Поле читает и старые строки; bulk_update записывает их сжатыми.
+    for name, fields in FIELDS.items():
+        model = apps.get_model('blog', name)
+        for batch in _batches(model, fields):
+            model.objects.bulk_update(batch, fields)
+
+
+def decompress_texts(apps, schema_editor):
+    for name, fields in FIELDS.items():
+        model = apps.get_model('blog', name)
+        table = schema_editor.quote_name(model._meta.db_table)
+        columns = ', '.join(
+            f'{schema_editor.quote_name(model._meta.get_field(field).column)}'
+            ' = %s'
+            for field in fields
+        )
+        pk = schema_editor.quote_name(model._meta.pk.column)
+        with schema_editor.connection.cursor() as cursor:
+            for batch in _batches(model, fields):
+                cursor.executemany(
+                    f'UPDATE {table} SET {columns} WHERE {pk} = %s',
+                    [
+                        [getattr(row, field) for field in fields] + [row.pk]
+                        for row in batch
+                    ]
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0028_postbody_html'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='text',
+            field=blog.fields.CompressedTextField(verbose_name='Текст комментария'),
+        ),
+        migrations.AlterField(
+            model_name='postbody',
+            name='text',
+            field=blog.fields.CompressedTextField(verbose_name='Текст'),
+        ),
+        migrations.AlterField(
+            model_name='postbody',
+            name='html',
+            field=blog.fields.CompressedTextField(blank=True, editable=False, verbose_name='HTML'),
+        ),
+        migrations.RunPython(compress_texts, decompress_texts),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0029_compress_texts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageCacheLock',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='Ключ')),
+                ('token', models.CharField(max_length=32, verbose_name='Владелец')),
+                ('expires_at', models.DateTimeField(verbose_name='Истекает')),
+            ],
+            options={
+                'verbose_name': 'блокировка кэша страницы',
+                'verbose_name_plural': 'Блокировки кэша страниц',
+            },
+        ),
+    ]
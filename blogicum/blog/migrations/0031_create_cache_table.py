@@ -0,0 +1,22 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # Таблица кэша по умолчанию (settings.CACHES без memcached); для
+    # других бэкендов и уже созданной таблицы команда ничего не делает.
+    call_command(
+        'createcachetable', database=schema_editor.connection.alias,
+        verbosity=0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0030_pagecachelock'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,129 @@
+from http import HTTPStatus
+
 from pages.views import csrf_failure
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .dimensions import attach_dimensions
+from .pagecache import get_or_refresh
+from .querycache import table_versions
+from .uploads import ImageUploadHandler
+
+
+class CachedObjectMixin:
+    """Объект загружается из БД не более одного раза за запрос."""
 
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_cached_object'):
+            self._cached_object = super().get_object(queryset)
+        return self._cached_object
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+
+class OnlyAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
     def test_func(self):
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return csrf_failure(
             self.request,
             reason="Вы не являетесь автором этого объекта."
         )
+
+
+class PostFeedMixin:
+    """Категории и локации карточек берутся из памяти процесса."""
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(queryset, page_size)
+        )
+        page.object_list = attach_dimensions(list(object_list))
+        return paginator, page, page.object_list, is_paginated
+
+
+class HotPageMixin:
+    """Готовый HTML страницы для анонимных посетителей из кэша.
+
+    Страница пересчитывается, когда меняется любая из page_cache_models
+    или истекает её TTL, см. blog.pagecache. Ключ — путь и номер
+    страницы: прочие параметры запроса на ответ не влияют и не должны
+    плодить записи в кэше.
+    """
+
+    page_cache_models = ()
+
+    def page_cache_key(self, request):
+        page = request.GET.get(getattr(self, 'page_kwarg', 'page'), '1')
+        if page != 'last':
+            if not page.isdecimal() or int(page) < 1:
+                # Ответ — ошибка 404, кэшировать нечего.
+                return None
+            page = str(int(page))
+        return f'page:{request.path}:{page}'
+
+    def get(self, request, *args, **kwargs):
+        key = self.page_cache_key(request)
+        if request.user.is_authenticated or key is None:
+            return super().get(request, *args, **kwargs)
+
+        def render():
+            response = super(HotPageMixin, self).get(
+                request, *args, **kwargs
+            )
+            response.render()
+            return response['Content-Type'], response.content
+
+        content_type, content = get_or_refresh(
+            key,
+            render,
+            versions=table_versions(sorted(
+                model._meta.db_table for model in self.page_cache_models
+            ))
+        )
+        return HttpResponse(content, content_type=content_type)
+
+
+def request_too_large(request):
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return False
+    return content_length > settings.POST_UPLOAD_MAX_REQUEST_SIZE
+
+
+class ImageUploadMixin:
+    """Загрузка изображения через ImageUploadHandler.
+
+    Обработчики загрузки нельзя заменить после чтения request.POST,
+    а CsrfViewMiddleware читает его раньше представления, поэтому
+    проверка CSRF переносится внутрь, после замены обработчиков.
+    Запрос длиннее POST_UPLOAD_MAX_REQUEST_SIZE получает ответ 413
+    без чтения тела.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        protected = csrf_protect(super().as_view(**initkwargs))
+
+        @csrf_exempt
+        def view(request, *args, **kwargs):
+            if request_too_large(request):
+                return HttpResponse(
+                    'Размер запроса больше допустимого.',
+                    content_type='text/plain; charset=utf-8',
+                    status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                )
+            request.upload_handlers = [ImageUploadHandler(request)]
+            return protected(request, *args, **kwargs)
+        return view
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        upload_errors = getattr(self.request, 'upload_errors', {})
+        if form.is_bound and upload_errors:
+            form.full_clean()
+            for field, message in upload_errors.items():
+                form.add_error(field, message)
+        return form
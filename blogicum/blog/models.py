@@ -1,12 +1,24 @@
-from django.db import models
+import math
+
+from django.apps import apps
+from django.db import models, router, transaction
 from django.utils import timezone
+from django.utils.text import Truncator
 from django.contrib.auth import get_user_model
-from .querysets import PostQuerySet, CategoryQuerySet
+from .fields import CompressedTextField
+from .querysets import (
+    CategoryQuerySet, CommentQuerySet, LocationQuerySet, PopularPostQuerySet,
+    PostQuerySet
+)
+from .rendering import RENDERER_VERSION, render_text, rendered_html
 
 User = get_user_model()
 
 MAX_TITLE_LENGTH = 256
 MAX_NAME_LENGTH = 20
+EXCERPT_WORDS = 10
+READING_WORDS_PER_MINUTE = 200
+TEXT_STATS_FIELDS = ('excerpt', 'word_count', 'reading_time')
 
 
 class BaseModel(models.Model):
@@ -72,6 +84,8 @@ class Location(BaseModel):
         verbose_name="местоположение"
     )
 
+    objects = LocationQuerySet.as_manager()
+
     class Meta(BaseModel.Meta):
         verbose_name = "местоположение"
         verbose_name_plural = "Местоположения"
@@ -105,7 +119,6 @@ class Post(BaseModel):
         max_length=MAX_TITLE_LENGTH,
         verbose_name="Заголовок"
     )
-    text = models.TextField(blank=False, verbose_name='Текст')
     pub_date = models.DateTimeField(
         blank=False,
         verbose_name="Дата и время публикации",
@@ -118,6 +131,24 @@ class Post(BaseModel):
         upload_to='post_images/',
         blank=True
     )
+    view_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотров'
+    )
+    # Считаются из text при сохранении, чтобы списки не загружали PostBody.
+    excerpt = models.CharField(
+        'Начало текста',
+        max_length=MAX_TITLE_LENGTH,
+        blank=True,
+        editable=False
+    )
+    word_count = models.PositiveIntegerField(
+        'Слов', default=0, editable=False
+    )
+    reading_time = models.PositiveSmallIntegerField(
+        'Время чтения, мин', default=0, editable=False
+    )
 
     objects = PostQuerySet.as_manager()
 
@@ -125,10 +156,155 @@ class Post(BaseModel):
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         default_related_name = 'posts'
+        indexes = [
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_pub_date_idx'
+            ),
+        ]
+
+    _pending_text = None
 
     def __str__(self):
         return self.title
 
+    @property
+    def text(self):
+        """Текст из PostBody.
+
+        Это не поле модели: в запросах текст — body__text. Без
+        select_related('body') обращение делает отдельный запрос.
+        """
+        if self._pending_text is not None:
+            return self._pending_text
+        try:
+            return self.body.text
+        except PostBody.DoesNotExist:
+            return ''
+
+    @text.setter
+    def text(self, value):
+        # Записывается в PostBody при save().
+        self._pending_text = value
+
+    def _text_changed(self):
+        if self._pending_text is None:
+            return False
+        if not Post.body.related.is_cached(self):
+            return True
+        # Форма редактирования присваивает текст всегда; неизменённый
+        # не нужно ни записывать, ни рендерить заново.
+        return self._pending_text != self.body.text
+
+    @property
+    def text_html(self):
+        """Текст в HTML; сохранённый при записи, если версия актуальна."""
+        if self._pending_text is None:
+            try:
+                body = self.body
+            except PostBody.DoesNotExist:
+                return ''
+            if body.renderer_version == RENDERER_VERSION:
+                return rendered_html(body.html)
+        return rendered_html(render_text(self.text))
+
+    def update_text_stats(self):
+        self.excerpt = Truncator(
+            Truncator(self.text).words(EXCERPT_WORDS, truncate=' …')
+        ).chars(MAX_TITLE_LENGTH)
+        self.word_count = len(self.text.split())
+        self.reading_time = math.ceil(
+            self.word_count / READING_WORDS_PER_MINUTE
+        )
+
+    def save(self, *args, update_fields=None, **kwargs):
+        text_changed = save_text = self._text_changed()
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            save_text = save_text and 'text' in update_fields
+            update_fields.discard('text')
+        if save_text:
+            self.update_text_stats()
+            if update_fields is not None:
+                update_fields.update(TEXT_STATS_FIELDS)
+        using = kwargs.get('using') or router.db_for_write(
+            Post, instance=self
+        )
+        # Публикация без текста или со старым текстом при новой
+        # статистике не должна стать видна другим запросам.
+        with transaction.atomic(using=using):
+            super().save(*args, update_fields=update_fields, **kwargs)
+            if save_text:
+                body = PostBody(post=self, text=self._pending_text)
+                body.save(using=using)
+        if save_text:
+            Post.body.related.set_cached_value(self, body)
+        if save_text or not text_changed:
+            self._pending_text = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        # view_count пишет только ViewCounter.flush() через UPDATE с F();
+        # обычное сохранение вернуло бы прочитанное раньше значение.
+        # Если строки нет, Django вставит её со всеми полями.
+        if update_fields is None:
+            values = [
+                value for value in values
+                if value[0].attname != 'view_count'
+            ]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
+
+    def refresh_from_db(self, using=None, fields=None):
+        """Заодно сбрасывает несохранённый и загруженный текст."""
+        refresh_text = fields is None or 'text' in fields
+        if fields is not None:
+            fields = [name for name in fields if name != 'text']
+        if refresh_text:
+            self._pending_text = None
+            if Post.body.related.is_cached(self):
+                Post.body.related.delete_cached_value(self)
+        if fields is None or fields:
+            super().refresh_from_db(using=using, fields=fields)
+
+
+class PostBody(models.Model):
+    """Текст публикации.
+
+    Вынесен из blog_post, чтобы строки ленты оставались узкими: выборки
+    по дате и категории читают только метаданные, а текст загружают
+    страницы публикации и её редактирования.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='body',
+        verbose_name='Публикация'
+    )
+    text = CompressedTextField('Текст')
+    html = CompressedTextField('HTML', blank=True, editable=False)
+    renderer_version = models.PositiveSmallIntegerField(
+        'Версия рендера', default=0, editable=False
+    )
+
+    class Meta:
+        verbose_name = 'текст публикации'
+        verbose_name_plural = 'Тексты публикаций'
+
+    def __str__(self):
+        return str(self.post_id)
+
+    def render(self):
+        self.html = render_text(self.text)
+        self.renderer_version = RENDERER_VERSION
+
+    def save(self, *args, **kwargs):
+        self.render()
+        super().save(*args, **kwargs)
+
 
 class Comment(BaseModelComments):
     post = models.ForeignKey(
@@ -139,12 +315,14 @@ class Comment(BaseModelComments):
         User,
         on_delete=models.CASCADE,
     )
-    text = models.TextField('Текст комментария')
+    text = CompressedTextField('Текст комментария')
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Добавлено'
     )
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
@@ -153,3 +331,98 @@ class Comment(BaseModelComments):
 
     def __str__(self) -> str:
         return self.text
+
+
+class PopularPost(models.Model):
+    """Предрассчитанный рейтинг, см. blog.popularity."""
+
+    post = models.ForeignKey(
+        'Post',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация'
+    )
+    category = models.ForeignKey(
+        'Category',
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+',
+        verbose_name='Категория',
+        help_text='Пусто — общий рейтинг.'
+    )
+    rank = models.PositiveSmallIntegerField('Место')
+    score = models.FloatField('Оценка')
+    computed_at = models.DateTimeField('Рассчитано')
+
+    objects = PopularPostQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'популярная публикация'
+        verbose_name_plural = 'Популярные публикации'
+        ordering = ('category', 'rank')
+        indexes = [
+            models.Index(
+                fields=['category', 'rank'],
+                name='popular_category_rank_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.rank}. {self.post_id}'
+
+
+class InvalidationEvent(models.Model):
+    """Событие шины сброса кэшей, см. blog.bus."""
+
+    topic = models.CharField('Тема', max_length=32)
+    key = models.CharField('Ключ', max_length=MAX_TITLE_LENGTH)
+    origin = models.CharField('Процесс-источник', max_length=32)
+    created_at = models.DateTimeField(
+        'Записано', auto_now_add=True, db_index=True
+    )
+
+    class Meta:
+        verbose_name = 'событие сброса кэша'
+        verbose_name_plural = 'События сброса кэша'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.topic}:{self.key}'
+
+
+class ModerationJob(models.Model):
+    """Отложенное массовое удаление, см. blog.moderation."""
+
+    model_label = models.CharField('Модель', max_length=64)
+    object_ids = models.JSONField('Первичные ключи')
+    created_at = models.DateTimeField('Поставлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'задание модерации'
+        verbose_name_plural = 'Задания модерации'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.model_label}: {len(self.object_ids)}'
+
+    def target_model(self):
+        return apps.get_model(self.model_label)
+
+
+class PageCacheLock(models.Model):
+    """Блокировка пересчёта горячей страницы, см. blog.pagecache.
+
+    Хранится в БД, потому что она общая для всех процессов и, в отличие
+    от файлового кэша, умеет атомарную вставку.
+    """
+
+    key = models.CharField('Ключ', max_length=40, primary_key=True)
+    token = models.CharField('Владелец', max_length=32)
+    expires_at = models.DateTimeField('Истекает')
+
+    class Meta:
+        verbose_name = 'блокировка кэша страницы'
+        verbose_name_plural = 'Блокировки кэша страниц'
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,40 @@
+"""Массовая модерация из админки.
+
+Публикация, снятие с публикации и удаление выполняются set-based
+операциями blog.bulk. Удаление больше MODERATION_SYNC_LIMIT строк не
+выполняется в запросе: строки сразу снимаются с публикации, а удаление
+ставится в очередь ModerationJob, которую разбирает команда
+run_moderation_jobs.
+"""
+from django.conf import settings
+
+from . import bulk
+from .models import ModerationJob
+
+
+def bulk_delete(queryset):
+    """Удаляет выборку сразу или ставит в очередь, если она велика.
+
+    Возвращает пару (удалено сейчас, поставлено в очередь).
+    """
+    model = queryset.model
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    if len(ids) <= settings.MODERATION_SYNC_LIMIT:
+        return bulk.delete_ids(model, ids), 0
+    if any(field.name == 'is_published' for field in model._meta.fields):
+        bulk.update(model._base_manager.filter(pk__in=ids),
+                    is_published=False)
+    ModerationJob.objects.bulk_create(
+        ModerationJob(model_label=model._meta.label, object_ids=chunk)
+        for chunk in bulk.chunks(ids)
+    )
+    return 0, len(ids)
+
+
+def run_pending_jobs():
+    """Выполняет поставленные в очередь удаления; возвращает число строк."""
+    rows = 0
+    for job in ModerationJob.objects.order_by('id').iterator():
+        rows += bulk.delete_ids(job.target_model(), job.object_ids)
+        job.delete()
+    return rows
@@ -0,0 +1,131 @@
+"""Кэш горячих страниц с защитой от одновременного пересчёта.
+
+Запись хранит значение, версии таблиц, из которых оно построено, и
+момент, до которого оно свежее (TTL со случайным разбросом, чтобы
+записи не истекали одновременно). Устаревшую запись пересчитывает
+только процесс, взявший блокировку (строка PageCacheLock в БД, общая
+для всех процессов), остальные в это время отдают старое значение.
+Если пересчёт падает из-за недоступной БД, отдаётся последнее удачное
+значение.
+"""
+import hashlib
+import logging
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+
+from .models import PageCacheLock
+
+logger = logging.getLogger(__name__)
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _is_fresh(entry, versions, now):
+    return (
+        entry is not None
+        and entry['versions'] == versions
+        and now < entry['fresh_until']
+    )
+
+
+def _is_servable(entry, now):
+    return (
+        entry is not None
+        and now < entry['fresh_until'] + settings.PAGE_CACHE_STALE_TTL
+    )
+
+
+def _wait_for_refresh(key, versions):
+    deadline = time.time() + settings.PAGE_CACHE_LOCK_WAIT
+    while time.time() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if _is_fresh(entry, versions, time.time()):
+            return entry
+    return None
+
+
+def _lock_key(key):
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def acquire_lock(key):
+    """Токен блокировки пересчёта key или None, если она уже занята."""
+    lock_key = _lock_key(key)
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.PAGE_CACHE_LOCK_TIMEOUT)
+    try:
+        with transaction.atomic():
+            PageCacheLock.objects.create(
+                key=lock_key, token=token, expires_at=expires_at
+            )
+        return token
+    except IntegrityError:
+        pass
+    # Блокировку упавшего процесса забирает первый, кто застал её
+    # истёкшей: условный UPDATE изменит строку только у одного.
+    taken = PageCacheLock.objects.filter(
+        key=lock_key, expires_at__lte=now
+    ).update(token=token, expires_at=expires_at)
+    return token if taken else None
+
+
+def release_lock(key, token):
+    PageCacheLock.objects.filter(key=_lock_key(key), token=token).delete()
+
+
+def _store(key, value, versions):
+    jitter = settings.PAGE_CACHE_JITTER
+    ttl = settings.PAGE_CACHE_TTL * random.uniform(1 - jitter, 1 + jitter)
+    # Запись живёт долго, чтобы пережить недоступность БД; свежесть
+    # определяет fresh_until.
+    cache.set(key, {
+        'value': value,
+        'versions': versions,
+        'fresh_until': time.time() + ttl,
+    }, settings.PAGE_CACHE_LAST_GOOD_TTL)
+
+
+def get_or_refresh(key, compute, versions=None):
+    """Значение из кэша или результат compute() с единичным пересчётом."""
+    entry = cache.get(key)
+    now = time.time()
+    if _is_fresh(entry, versions, now):
+        return entry['value']
+
+    try:
+        token = acquire_lock(key)
+    except DatabaseError:
+        # БД недоступна: compute() ниже упадёт так же и вернёт
+        # сохранённое значение, ждать чужого пересчёта незачем.
+        token = None
+    else:
+        if token is None:
+            if _is_servable(entry, now):
+                return entry['value']
+            fresh = _wait_for_refresh(key, versions)
+            if fresh is not None:
+                return fresh['value']
+    try:
+        value = compute()
+    except DatabaseError:
+        if entry is None:
+            raise
+        logger.warning('БД недоступна, отдаём сохранённую версию %s', key)
+        return entry['value']
+    finally:
+        if token is not None:
+            try:
+                release_lock(key, token)
+            except DatabaseError:
+                logger.warning('Не удалось снять блокировку %s', key)
+    _store(key, value, versions)
+    return value
@@ -0,0 +1,126 @@
+"""Рейтинг «популярно сейчас», считаемый пакетно на NumPy.
+
+Оценка публикации — сумма её просмотров и комментариев, у каждого из
+которых вес экспоненциально затухает с периодом полураспада
+POPULAR_POSTS_HALF_LIFE. Для просмотров известен только общий счётчик,
+поэтому их вес затухает от даты публикации, для комментариев — от даты
+каждого комментария.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comment, PopularPost, Post
+
+VIEW_WEIGHT = 1.0
+COMMENT_WEIGHT = 10.0
+
+
+def decay(ages_seconds, half_life_seconds):
+    return np.exp2(-ages_seconds / half_life_seconds)
+
+
+def compute_scores(view_counts, post_ages, comment_post_index, comment_ages,
+                   half_life):
+    """Оценки всех публикаций за один векторный проход.
+
+    comment_post_index — индекс публикации в массивах постов для
+    каждого комментария.
+    """
+    scores = VIEW_WEIGHT * view_counts * decay(post_ages, half_life)
+    scores += COMMENT_WEIGHT * np.bincount(
+        comment_post_index,
+        weights=decay(comment_ages, half_life),
+        minlength=len(view_counts)
+    )
+    return scores
+
+
+def top_per_group(scores, groups, top):
+    """Индексы лучших `top` публикаций в каждой группе по убыванию оценки."""
+    order = np.lexsort((-scores, groups))
+    sorted_groups = groups[order]
+    group_starts = np.flatnonzero(
+        np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    )
+    rank = np.arange(len(order)) - np.repeat(
+        group_starts, np.diff(np.r_[group_starts, len(order)])
+    )
+    keep = order[rank < top]
+    return keep, rank[rank < top]
+
+
+def load_activity(now, window):
+    since = now - window
+    posts = list(
+        Post.objects.published()
+        .filter(pub_date__gte=since)
+        .order_by('pk')
+        .values_list('pk', 'category_id', 'view_count', 'pub_date')
+    )
+    count = len(posts)
+    post_ids = np.fromiter((row[0] for row in posts), np.int64, count)
+    categories = np.fromiter((row[1] for row in posts), np.int64, count)
+    view_counts = np.fromiter((row[2] for row in posts), np.float64, count)
+    post_ages = np.fromiter(
+        ((now - row[3]).total_seconds() for row in posts), np.float64, count
+    )
+
+    comments = list(
+        Comment.objects
+        .filter(created_at__gte=since)
+        .values_list('post_id', 'created_at')
+    )
+    comment_post_ids = np.fromiter(
+        (row[0] for row in comments), np.int64, len(comments)
+    )
+    comment_ages = np.fromiter(
+        ((now - row[1]).total_seconds() for row in comments),
+        np.float64, len(comments)
+    )
+    # Комментарии к публикациям вне выборки отбрасываются.
+    if count:
+        index = np.minimum(np.searchsorted(post_ids, comment_post_ids),
+                           count - 1)
+        known = post_ids[index] == comment_post_ids
+    else:
+        index = np.zeros(len(comments), np.int64)
+        known = np.zeros(len(comments), bool)
+    return (post_ids, categories, view_counts, post_ages,
+            index[known], comment_ages[known])
+
+
+def rebuild_popular_posts(now=None):
+    """Пересчитывает таблицу PopularPost; возвращает число строк."""
+    now = now or timezone.now()
+    half_life = settings.POPULAR_POSTS_HALF_LIFE.total_seconds()
+    top = settings.POPULAR_POSTS_TOP
+    (post_ids, categories, view_counts, post_ages,
+     comment_index, comment_ages) = load_activity(
+        now, timedelta(days=settings.POPULAR_POSTS_WINDOW_DAYS)
+    )
+    scores = compute_scores(
+        view_counts, post_ages, comment_index, comment_ages, half_life
+    )
+
+    rows = []
+    overall = np.zeros(len(scores), np.int64)
+    for groups, by_category in ((categories, True), (overall, False)):
+        keep, ranks = top_per_group(scores, groups, top)
+        rows.extend(
+            PopularPost(
+                post_id=int(post_ids[i]),
+                category_id=int(categories[i]) if by_category else None,
+                rank=int(rank) + 1,
+                score=float(scores[i]),
+                computed_at=now,
+            )
+            for i, rank in zip(keep, ranks)
+        )
+    with transaction.atomic():
+        PopularPost.objects.all().delete()
+        PopularPost.objects.bulk_create(rows)
+    return len(rows)
@@ -0,0 +1,94 @@
+"""Кэшированная сводка по автору для страницы профиля.
+
+Сводку пересчитывает один агрегирующий запрос, когда меняются
+публикации автора, сам пользователь или любая категория. Число
+полученных комментариев хранится отдельным ключом и сбрасывается
+при добавлении и удалении комментария: incr() не везде атомарен
+(DatabaseCache), и одновременные изменения терялись бы.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+from django.http import Http404
+from django.utils import timezone
+
+from .dimensions import categories
+from .models import Comment, Post
+
+User = get_user_model()
+
+PROFILE_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'date_joined', 'is_staff',
+)
+USERNAME_KEY = 'profile_id:{}'
+COMMENTS_KEY = 'profile_comments:{}'
+
+
+def _summary_key(user_id):
+    # Версия категорий входит в ключ: смена публикации категории меняет
+    # число опубликованных постов у всех авторов.
+    return f'profile_summary:{categories.current_version()}:{user_id}'
+
+
+def _build_summary(user):
+    now = timezone.now()
+    published = Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=now
+    )
+    stats = Post.objects.filter(author=user).aggregate(
+        total_post_count=Count('id'),
+        post_count=Count('id', filter=published),
+        last_post_date=Max('pub_date', filter=published),
+        # Отложенная публикация изменит сводку, когда наступит её время.
+        stale_after=Min('pub_date', filter=Q(pub_date__gt=now)),
+    )
+    stats['user'] = {name: getattr(user, name) for name in PROFILE_FIELDS}
+    return stats
+
+
+def get_profile_summary(username):
+    """Пользователь (без запроса к БД при тёплом кэше) и его сводка."""
+    user_id = cache.get(USERNAME_KEY.format(username))
+    summary = None
+    if user_id is not None:
+        summary = cache.get(_summary_key(user_id))
+        if summary is not None and (
+            summary['user']['username'] != username
+            or summary['stale_after'] is not None
+            and summary['stale_after'] <= timezone.now()
+        ):
+            summary = None
+
+    if summary is None:
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise Http404
+        summary = _build_summary(user)
+        cache.set_many({
+            USERNAME_KEY.format(username): user.pk,
+            _summary_key(user.pk): summary,
+        }, settings.PROFILE_CACHE_TIMEOUT)
+
+    user_id = summary['user']['id']
+    comment_count = cache.get(COMMENTS_KEY.format(user_id))
+    if comment_count is None:
+        comment_count = Comment.objects.filter(post__author_id=user_id).count()
+        cache.add(
+            COMMENTS_KEY.format(user_id), comment_count,
+            settings.PROFILE_CACHE_TIMEOUT
+        )
+    return User(**summary['user']), dict(summary, comment_count=comment_count)
+
+
+def invalidate_profile(user_id, comments=False):
+    cache.delete(_summary_key(user_id))
+    if comments:
+        cache.delete(COMMENTS_KEY.format(user_id))
+
+
+def invalidate_comment_count(author_id):
+    # Счётчик посчитают заново при следующем просмотре профиля.
+    cache.delete(COMMENTS_KEY.format(author_id))
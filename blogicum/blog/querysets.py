@@ -1,14 +1,99 @@
-from django.db import models
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, transaction
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Count, Q
 
+from .bus import bus
+from .querycache import key_where, result_key
 
-class PostQuerySet(models.QuerySet):
-    def published(self):
+
+class CachedQuerySet(models.QuerySet):
+    """QuerySet с необязательным кэшем результатов, см. cached()."""
+
+    _cache_timeout = None
+
+    def cached(self, timeout=None):
+        clone = self._chain()
+        clone._cache_timeout = timeout or settings.QUERYSET_CACHE_TIMEOUT
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cache_timeout = self._cache_timeout
+        return clone
+
+    def _result_key(self, kind):
+        query = self.query.chain()
+        query.where = key_where(query.where)
+        try:
+            sql, params = query.get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return None
+        tables = sorted({
+            join.table_name for join in query.alias_map.values()
+        })
+        return result_key(kind, self.db, sql, params, tables)
+
+    def _fetch_all(self):
+        if self._result_cache is not None or self._cache_timeout is None:
+            return super()._fetch_all()
+        key = self._result_key('rows')
+        if key is not None:
+            rows = cache.get(key)
+            if rows is not None:
+                self._result_cache = rows
+                self._prefetch_done = True
+                return
+        super()._fetch_all()
+        if key is not None:
+            cache.set(key, self._result_cache, self._cache_timeout)
+
+    def count(self):
+        if self._result_cache is not None or self._cache_timeout is None:
+            return super().count()
+        key = self._result_key('count')
+        count = cache.get(key) if key is not None else None
+        if count is None:
+            count = super().count()
+            if key is not None:
+                cache.set(key, count, self._cache_timeout)
+        return count
+
+    def _invalidate(self, labels=()):
+        bus.publish('table', *{self.model._meta.db_table}.union(
+            apps.get_model(label)._meta.db_table for label in labels
+        ))
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        self._invalidate()
+        return rows
+
+    def delete(self):
+        deleted, per_model = super().delete()
+        self._invalidate(per_model)
+        return deleted, per_model
+
+    def bulk_create(self, *args, **kwargs):
+        objs = super().bulk_create(*args, **kwargs)
+        self._invalidate()
+        return objs
+
+    def bulk_update(self, *args, **kwargs):
+        rows = super().bulk_update(*args, **kwargs)
+        self._invalidate()
+        return rows
+
+
+class PostQuerySet(CachedQuerySet):
+    def published(self, now=None):
         return self.filter(
             is_published=True,
             category__is_published=True,
-            pub_date__lte=timezone.now()
+            pub_date__lte=now or timezone.now()
         )
 
     def ordered(self):
@@ -20,7 +105,84 @@ class PostQuerySet(models.QuerySet):
     def with_related(self):
         return self.select_related("author", "category", "location")
 
+    def with_body(self):
+        return self.select_related("body")
 
-class CategoryQuerySet(models.QuerySet):
+    def for_feed(self):
+        """Категории и локации подставляет PostFeedMixin.
+
+        Карточке хватает excerpt, текст (PostBody) не загружается.
+        """
+        return self.select_related("author")
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Вместе с публикациями создаёт тексты (PostBody), если заданы.
+
+        Для PostBody нужны ключи новых публикаций, а SQLite не возвращает
+        их из bulk_create(): публикации с текстом здесь не создаются
+        вовсе, а не молча теряют текст.
+        """
+        objs = list(objs)
+        with_text = [post for post in objs if post._pending_text is not None]
+        if not with_text:
+            return super().bulk_create(objs, *args, **kwargs)
+        if not connections[self.db].features.can_return_rows_from_bulk_insert:
+            raise ValueError(
+                'СУБД не возвращает ключи из bulk_create(): создайте '
+                'публикации без текста, затем их PostBody.'
+            )
+        body_model = self.model.body.related.related_model
+        for post in with_text:
+            post.update_text_stats()
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            bodies = [
+                body_model(post=post, text=post._pending_text)
+                for post in with_text
+            ]
+            for body in bodies:
+                body.render()
+            body_model._base_manager.using(self.db).bulk_create(bodies)
+        for post in with_text:
+            post._pending_text = None
+        return objs
+
+    def visible_to(self, user):
+        """Автору доступны все его публикации, остальным — опубликованные."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(
+            Q(author=user)
+            | Q(
+                is_published=True,
+                category__is_published=True,
+                pub_date__lte=timezone.now()
+            )
+        )
+
+
+class CategoryQuerySet(CachedQuerySet):
     def published(self):
         return self.filter(is_published=True)
+
+
+class LocationQuerySet(CachedQuerySet):
+    pass
+
+
+class CommentQuerySet(CachedQuerySet):
+    pass
+
+
+class PopularPostQuerySet(CachedQuerySet):
+    def for_category(self, category=None):
+        """Рейтинг категории или, без аргумента, общий рейтинг."""
+        return (
+            self.filter(
+                category=category,
+                post__is_published=True,
+                post__category__is_published=True
+            )
+            .select_related("post")
+            .order_by("rank")
+        )
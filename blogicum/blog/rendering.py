@@ -0,0 +1,19 @@
+"""Преобразование текста публикации в HTML.
+
+Результат хранится в PostBody.html вместе с RENDERER_VERSION. При любом
+изменении render_text версию нужно увеличить: страницы со старой версией
+рендерятся на лету, пока команда rerender_post_bodies не обновит строки.
+"""
+from django.template.defaultfilters import linebreaksbr
+from django.utils.safestring import mark_safe
+
+RENDERER_VERSION = 1
+
+
+def render_text(text):
+    return str(linebreaksbr(text, autoescape=True))
+
+
+def rendered_html(html):
+    """Сохранённый HTML как безопасная строка для шаблона."""
+    return mark_safe(html)
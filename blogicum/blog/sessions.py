@@ -0,0 +1,73 @@
+"""Сессии в БД с чтением через кэш и без лишних записей.
+
+Подключается через SESSION_ENGINE = 'blog.sessions'. Кэш сессий
+(SESSION_CACHE_ALIAS) при нескольких процессах должен быть общим,
+иначе выход из аккаунта в одном процессе не увидят остальные; в
+настройках это файловый кэш (CACHES).
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore
+)
+from django.utils import timezone
+
+WRITTEN_KEY = '_session_written'
+
+
+class SessionStore(CachedDBStore):
+    """cached_db, который не перезаписывает неизменившиеся сессии.
+
+    Сессия с прежними данными пишется в БД не чаще раза в
+    SESSION_WRITE_INTERVAL секунд — только чтобы продлить срок жизни.
+    """
+
+    _loaded_digest = None
+
+    def _digest(self, data):
+        state = {key: value for key, value in data.items()
+                 if key != WRITTEN_KEY}
+        return hashlib.sha1(self.serializer().dumps(state)).hexdigest()
+
+    def load(self):
+        data = super().load()
+        self._loaded_digest = self._digest(data)
+        return data
+
+    def _needs_write(self):
+        if self._loaded_digest is None:
+            return True
+        data = self._get_session()
+        if self._digest(data) != self._loaded_digest:
+            return True
+        written = data.get(WRITTEN_KEY, 0)
+        return time.time() - written >= settings.SESSION_WRITE_INTERVAL
+
+    def save(self, must_create=False):
+        if not must_create and self.session_key and not self._needs_write():
+            return
+        data = self._get_session(no_load=must_create)
+        data[WRITTEN_KEY] = int(time.time())
+        super().save(must_create)
+        self._loaded_digest = self._digest(data)
+
+    @classmethod
+    def clear_expired(cls):
+        """Удаляет истёкшие сессии порциями по SESSION_CLEAR_CHUNK_SIZE.
+
+        Каждая порция — отдельный короткий DELETE, поэтому команда
+        clearsessions не держит блокировку на всю таблицу.
+        """
+        model = cls.get_model_class()
+        while True:
+            keys = list(
+                model.objects
+                .filter(expire_date__lt=timezone.now())
+                .values_list('session_key', flat=True)
+                [:settings.SESSION_CLEAR_CHUNK_SIZE]
+            )
+            if not keys:
+                break
+            model.objects.filter(session_key__in=keys).delete()
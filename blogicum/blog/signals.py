@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .bus import bus
+from .dimensions import categories, locations
+from .middleware import invalidate_cached_user
+from .models import Category, Comment, Location, Post
+from .profiles import invalidate_comment_count, invalidate_profile
+from .querycache import invalidate_tables
+
+User = get_user_model()
+
+# Таблицы, чьи изменения сбрасывают кэш querysets (см. blog.querycache).
+QUERYSET_CACHE_MODELS = (User, Post, Comment, Category, Location)
+
+DIMENSIONS = {
+    Category._meta.label_lower: categories,
+    Location._meta.label_lower: locations,
+}
+
+
+# Обработчики событий шины (blog.bus). shared=True — сброс общего
+# кэша, выполняется только в процессе, где произошло изменение;
+# остальные выполняются во всех процессах.
+
+@bus.subscribe('user', shared=True)
+def apply_user_event(user_id):
+    invalidate_cached_user(user_id)
+    invalidate_profile(user_id)
+
+
+@bus.subscribe('session_user', shared=True)
+def apply_session_user_event(user_id):
+    invalidate_cached_user(user_id)
+
+
+@bus.subscribe('profile', shared=True)
+def apply_profile_event(user_id):
+    invalidate_profile(user_id, comments=True)
+
+
+@bus.subscribe('dimension', shared=True)
+def apply_dimension_version_event(label):
+    DIMENSIONS[label].invalidate()
+
+
+@bus.subscribe('dimension')
+def apply_dimension_event(label):
+    DIMENSIONS[label].forget()
+
+
+@bus.subscribe('table', shared=True)
+def apply_table_event(table):
+    invalidate_tables(table)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    bus.publish('user', instance.pk)
+
+
+@receiver(user_logged_out)
+def drop_cached_user_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        bus.publish('session_user', user.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_dimensions(sender, **kwargs):
+    bus.publish('dimension', sender._meta.label_lower)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_author_profile(sender, instance, **kwargs):
+    # Число комментариев автора от сохранения публикации не меняется.
+    invalidate_profile(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_author_profile_on_delete(sender, instance, **kwargs):
+    bus.publish('profile', instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+def count_added_comment(sender, instance, created, **kwargs):
+    if created:
+        invalidate_comment_count(instance.post.author_id)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    # При каскадном удалении публикации пост не загружен, а счётчик
+    # автора сбрасывает invalidate_author_profile_on_delete.
+    if Comment.post.is_cached(instance):
+        invalidate_comment_count(instance.post.author_id)
+
+
+@receiver(post_save)
+def invalidate_cached_querysets(sender, **kwargs):
+    if sender in QUERYSET_CACHE_MODELS:
+        bus.publish('table', sender._meta.db_table)
+
+
+@receiver(post_delete)
+def invalidate_cached_querysets_on_delete(sender, **kwargs):
+    if sender in QUERYSET_CACHE_MODELS:
+        bus.publish('table', sender._meta.db_table)
+    if sender in (Category, Location):
+        # Ссылки в публикациях обнуляются без сигналов Post.
+        bus.publish('table', Post._meta.db_table)
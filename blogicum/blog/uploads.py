@@ -0,0 +1,103 @@
+"""Потоковая проверка загружаемых изображений публикаций.
+
+ImageUploadHandler заменяет стандартные обработчики загрузки: размер
+проверяется по мере чтения, формат — по сигнатуре в первых байтах,
+SHA-256 считается по ходу записи и сохраняется в атрибуте sha256
+файла (им пользуется blogicum.storage.ContentAddressedStorage). Запрос
+целиком длиннее POST_UPLOAD_MAX_REQUEST_SIZE отклоняется ответом 413
+ещё до разбора (blog.mixins.ImageUploadMixin), а слишком большой или
+не являющийся изображением файл пропускается с первого неподходящего
+фрагмента; текст ошибки попадает в request.upload_errors и выводится
+формой.
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile, TemporaryUploadedFile
+)
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+SNIFF_LENGTH = 12
+
+
+def sniff_image_format(head):
+    for signature, image_format in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+class ImageUploadHandler(FileUploadHandler):
+
+    def handle_raw_input(self, input_data, meta, content_length, boundary,
+                         encoding=None):
+        # StopUpload отсюда не перехватывается Django и даёт ответ 500,
+        # поэтому длина запроса проверяется до разбора, в представлении.
+        self.in_memory = (
+            content_length <= settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.head = b''
+        self.sha256 = hashlib.sha256()
+        if self.in_memory:
+            self.file = BytesIO()
+        else:
+            self.file = TemporaryUploadedFile(
+                self.file_name, self.content_type, 0, self.charset,
+                self.content_type_extra
+            )
+
+    def reject(self, message):
+        if self.request is not None:
+            if not hasattr(self.request, 'upload_errors'):
+                self.request.upload_errors = {}
+            self.request.upload_errors[self.field_name] = message
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.POST_IMAGE_MAX_SIZE:
+            self.reject(
+                'Размер изображения больше '
+                f'{settings.POST_IMAGE_MAX_SIZE // (1024 * 1024)} МБ.'
+            )
+            raise SkipFile
+        if len(self.head) < SNIFF_LENGTH:
+            self.head += raw_data[:SNIFF_LENGTH - len(self.head)]
+            if (len(self.head) == SNIFF_LENGTH
+                    and sniff_image_format(self.head) is None):
+                self.reject('Загрузите изображение в формате JPEG, PNG, '
+                            'GIF или WebP.')
+                raise SkipFile
+        self.sha256.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if sniff_image_format(self.head) is None:
+            # Файл короче SNIFF_LENGTH байт.
+            self.reject('Загрузите изображение в формате JPEG, PNG, '
+                        'GIF или WebP.')
+            self.file.close()
+            return None
+        self.file.seek(0)
+        if self.in_memory:
+            uploaded = InMemoryUploadedFile(
+                self.file, self.field_name, self.file_name,
+                self.content_type, file_size, self.charset,
+                self.content_type_extra
+            )
+        else:
+            uploaded = self.file
+            uploaded.size = file_size
+        uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
@@ -1,5 +1,3 @@
-from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import path, include
 from . import views
 
@@ -57,4 +55,4 @@ urlpatterns = [
     path(
         'profile/password/', views.ChangePasswordView,
         name='password_change')
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
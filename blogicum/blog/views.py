@@ -1,4 +1,3 @@
-from django.utils import timezone
 from django.shortcuts import get_object_or_404, redirect
 from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
@@ -6,13 +5,17 @@ from django.views.generic import (
     FormView, CreateView, ListView, DeleteView,
     DetailView, UpdateView, RedirectView
 )
-from django.http import Http404
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.auth.models import User
 from django.urls import reverse_lazy, reverse
 from .forms import PostForm, CommentForm
-from .models import Comment, Post, Category
-from .mixins import OnlyAuthorMixin
+from .models import Category, Comment, Location, PopularPost, Post
+from .bulk import delete_ids
+from .counters import post_views
+from .mixins import (
+    HotPageMixin, ImageUploadMixin, OnlyAuthorMixin, PostFeedMixin
+)
+from .profiles import get_profile_summary
+from .querycache import cacheable_now
 
 
 class RegistrationView(FormView):
@@ -25,10 +28,14 @@ class RegistrationView(FormView):
         return super().form_valid(form)
 
 
-class IndexView(ListView):
+class IndexView(HotPageMixin, PostFeedMixin, ListView):
     """Главная страница сайта."""
 
     model = Post
+    # Без User: вход пользователя сохраняет last_login и сбрасывал бы
+    # страницу. Новое имя автора в карточках появится через
+    # PAGE_CACHE_TTL.
+    page_cache_models = (Post, Comment, Category, Location, PopularPost)
     template_name = 'blog/index.html'
     context_object_name = 'object_list'
     paginate_by = settings.POSTS_PER_PAGE
@@ -36,13 +43,22 @@ class IndexView(ListView):
     def get_queryset(self):
         return (
             Post.objects
-            .published()
+            .published(now=cacheable_now())
+            .for_feed()
             .with_comments_count()
             .ordered()
+            .cached()
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['popular_posts'] = (
+            PopularPost.objects.for_category().cached()
         )
+        return context
 
 
-class CategoryView(LoginRequiredMixin, ListView):
+class CategoryView(LoginRequiredMixin, PostFeedMixin, ListView):
     """Страница публикаций конкретной категории."""
 
     template_name = 'blog/category.html'
@@ -51,42 +67,62 @@ class CategoryView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         self.category = get_object_or_404(
-            Category,
-            slug=self.kwargs['slug'],
-            is_published=True
+            Category.objects.published().cached(),
+            slug=self.kwargs['slug']
+        )
+        return (
+            self.category.posts
+            .published(now=cacheable_now())
+            .for_feed()
+            .ordered()
+            .with_comments_count()
+            .cached()
         )
-        return self.category.posts.published().ordered().with_comments_count()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
+        context['popular_posts'] = (
+            PopularPost.objects.for_category(self.category).cached()
+        )
         return context
 
 
-class ProfileView(ListView):
+class ProfileView(PostFeedMixin, ListView):
     model = Post
     template_name = "blog/profile.html"
     paginate_by = settings.POSTS_PER_PAGE
 
     def get_queryset(self):
-        user_profile = get_object_or_404(
-            User,
-            username=self.kwargs["username"]
+        self.profile, self.summary = get_profile_summary(
+            self.kwargs["username"]
         )
-        self.profile = user_profile
-
-        queryset = self.profile.posts.with_related().with_comments_count()
+        self.is_owner = self.request.user.pk == self.profile.pk
 
-        if not self.request.user.is_authenticated or \
-                self.request.user != user_profile:
+        queryset = (
+            Post.objects
+            .filter(author_id=self.profile.pk)
+            .for_feed()
+            .with_comments_count()
+        )
+        if not self.is_owner:
             queryset = queryset.published()
 
         return queryset.ordered()
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        # Число публикаций уже есть в сводке, COUNT(*) не нужен.
+        paginator.count = self.summary[
+            "total_post_count" if self.is_owner else "post_count"
+        ]
+        return paginator
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["profile"] = self.profile
-        context["author_post"] = self.request.user == self.profile
+        context["summary"] = self.summary
+        context["author_post"] = self.is_owner
         return context
 
 
@@ -104,7 +140,7 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(ImageUploadMixin, LoginRequiredMixin, CreateView):
     """Создание публикации."""
 
     model = Post
@@ -127,28 +163,30 @@ class PostDetailView(LoginRequiredMixin, DetailView):
     template_name = "blog/detail.html"
     context_object_name = "post"
 
-    def get_object(self, **kwargs):
-        queryset = self.model.objects.filter(pk=self.kwargs['post_id'])
-
-        post = queryset.first()
-        if post is None:
-            raise Http404
-
-        if self.request.user == post.author:
-            return get_object_or_404(queryset)
-
-        queryset = queryset.filter(
-            is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True
+    def get_object(self, queryset=None):
+        return get_object_or_404(
+            Post.objects.with_related().with_body()
+            .visible_to(self.request.user),
+            pk=self.kwargs['post_id']
         )
 
-        return get_object_or_404(queryset)
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        post_views.record(self.object.pk, request.session.session_key)
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = CommentForm()
-        context['comments'] = self.object.comments.order_by("created_at")
+        context['view_count'] = (
+            self.object.view_count + post_views.pending(self.object.pk)
+        )
+        context.setdefault('form', CommentForm())
+        context['comments'] = (
+            self.object.comments
+            .select_related('author')
+            .order_by('created_at')
+        )
         return context
 
     def post(self, request, *args, **kwargs):
@@ -165,26 +203,18 @@ class PostDetailView(LoginRequiredMixin, DetailView):
         return redirect("blog:post_detail", post_id=self.object.id)
 
 
-class PostEditView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
-    model = Post
+class PostEditView(
+        ImageUploadMixin, LoginRequiredMixin, OnlyAuthorMixin, UpdateView
+):
+    queryset = Post.objects.select_related('location').with_body()
     form_class = PostForm
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
 
-    def test_func(self):
-        self.object = self.get_object()
-        return (
-            self.request.user.is_authenticated
-            and self.object.author == self.request.user
-        )
-
     def dispatch(self, request, *args, **kwargs):
         if not self.test_func():
-            return redirect(reverse(
-                'blog:post_detail', kwargs={"post_id": self.object.pk}
-            ))
-        else:
-            return super().dispatch(request, *args, **kwargs)
+            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
+        return super().dispatch(request, *args, **kwargs)
 
     def get_success_url(self):
         return reverse('blog:post_detail', kwargs={"post_id": self.object.pk})
@@ -193,12 +223,18 @@ class PostEditView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
 class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     """Удаление публикации."""
 
-    model = Post
+    queryset = Post.objects.select_related('location')
     template_name = "blog/create.html"
 
     def get_success_url(self):
         return reverse("blog:index")
 
+    def delete(self, request, *args, **kwargs):
+        # Комментарии удаляются порциями, без загрузки в память.
+        self.object = self.get_object()
+        delete_ids(Post, [self.object.pk])
+        return redirect(self.get_success_url())
+
 
 class AddCommentView(LoginRequiredMixin, FormView):
     form_class = CommentForm
@@ -219,28 +255,30 @@ class AddCommentView(LoginRequiredMixin, FormView):
 class EditCommentView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
     """Редактирование комментария."""
 
-    model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
 
+    def get_queryset(self):
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
+
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': self.object.post.id})
+            kwargs={'post_id': self.object.post_id})
 
 
 class CommentDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     """Удаление комментария."""
 
-    model = Comment
     pk_url_kwarg = "comment_id"
     template_name = "blog/comment.html"
 
-    def get_object(self):
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs["comment_id"],
-            post_id=self.kwargs["post_id"]
+    def get_queryset(self):
+        # Автор поста нужен сигналу, который ведёт счётчик комментариев.
+        return (
+            Comment.objects
+            .select_related('post')
+            .filter(post_id=self.kwargs['post_id'])
         )
 
     def get_success_url(self):
@@ -0,0 +1,153 @@
+"""Минификация HTML и сжатие ответов gzip/brotli."""
+import codecs
+import gzip
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRESERVE_TAGS = ('pre', 'textarea', 'script', 'style')
+# Тег целиком, включая значения атрибутов в кавычках (в них может быть
+# и '>'), или HTML-комментарий.
+TAG_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(/?)([a-zA-Z][^\s/>]*)?(?:[^>"\']|"[^"]*"|\'[^\']*\')*>',
+    re.S
+)
+WHITESPACE_RE = re.compile(r'\s+')
+TAG_PART_RE = re.compile(r'"[^"]*"|\'[^\']*\'|\s+')
+TRAILING_WHITESPACE_RE = re.compile(r'\s+$')
+
+
+def _collapse(match):
+    return '\n' if '\n' in match.group() else ' '
+
+
+def collapse_whitespace(text):
+    return WHITESPACE_RE.sub(_collapse, text)
+
+
+def _collapse_tag_part(match):
+    part = match.group()
+    return part if part[0] in '"\'' else _collapse(match)
+
+
+def minify_tag(tag):
+    """Схлопывает пробелы между атрибутами, не трогая их значений."""
+    if tag.startswith('<!--'):
+        return tag
+    return TAG_PART_RE.sub(_collapse_tag_part, tag)
+
+
+class HTMLMinifier:
+    """Потоковое схлопывание пробелов в тексте HTML.
+
+    Последовательность пробельных символов между тегами заменяется одним
+    пробелом или переводом строки, поэтому вёрстка не меняется; в тегах
+    так же схлопываются пробелы между атрибутами. Значения атрибутов,
+    комментарии и содержимое pre, textarea, script и style передаются
+    как есть.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.closing = None
+
+    def feed(self, text):
+        self.buffer += text
+        output = []
+        while self.buffer:
+            if self.closing:
+                end = self.buffer.lower().find(self.closing)
+                if end == -1:
+                    cut = max(len(self.buffer) - len(self.closing) + 1, 0)
+                    output.append(self.buffer[:cut])
+                    self.buffer = self.buffer[cut:]
+                    break
+                cut = end + len(self.closing)
+                output.append(self.buffer[:cut])
+                self.buffer = self.buffer[cut:]
+                self.closing = None
+                continue
+            tag_start = self.buffer.find('<')
+            if tag_start == -1:
+                # Пробелы в конце могут продолжиться в следующем куске.
+                trailing = TRAILING_WHITESPACE_RE.search(self.buffer)
+                cut = trailing.start() if trailing else len(self.buffer)
+                output.append(collapse_whitespace(self.buffer[:cut]))
+                self.buffer = self.buffer[cut:]
+                break
+            output.append(collapse_whitespace(self.buffer[:tag_start]))
+            self.buffer = self.buffer[tag_start:]
+            match = TAG_RE.match(self.buffer)
+            if not match or (
+                self.buffer.startswith('<!--')
+                and not match.group().endswith('-->')
+            ):
+                # Тег или комментарий ещё не пришёл целиком.
+                break
+            output.append(minify_tag(match.group()))
+            self.buffer = self.buffer[match.end():]
+            name = (match.group(2) or '').lower()
+            if not match.group(1) and name in PRESERVE_TAGS:
+                self.closing = '</' + name
+        return ''.join(output)
+
+    def close(self):
+        rest = self.buffer
+        self.buffer = ''
+        return rest if self.closing else collapse_whitespace(rest)
+
+
+def minify_html(text):
+    minifier = HTMLMinifier()
+    return minifier.feed(text) + minifier.close()
+
+
+def minify_html_sequence(sequence, charset):
+    decoder = codecs.getincrementaldecoder(charset)()
+    minifier = HTMLMinifier()
+    for chunk in sequence:
+        text = minifier.feed(decoder.decode(chunk))
+        if text:
+            yield text.encode(charset)
+    yield (minifier.feed(decoder.decode(b'', final=True))
+           + minifier.close()).encode(charset)
+
+
+def compress_bytes(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_sequence(sequence, encoding, level):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in sequence:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    # Тот же формат, что у gzip.compress: zlib с заголовком gzip.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in sequence:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_variants(data):
+    """Пары (суффикс, сжатые данные) для предсжатой статики."""
+    variants = [('.gz', compress_bytes(data, 'gzip', 9))]
+    if brotli is not None:
+        variants.append(('.br', compress_bytes(data, 'br', 11)))
+    return [
+        (suffix, compressed) for suffix, compressed in variants
+        if len(compressed) < len(data)
+    ]
@@ -0,0 +1,164 @@
+"""Отдача статики и медиафайлов без фронтового веб-сервера."""
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Имена вида style.3f2a9c1b7d4e.css, которые даёт ManifestStaticFilesStorage.
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+# Предпочитаемые кодировки и суффиксы предсжатых копий.
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def accepted_encodings(request):
+    encodings = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        encodings.add(coding.strip().lower())
+    return encodings
+
+
+def resolve_path(document_root, path):
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(document_root, path))
+    if not fullpath.is_file():
+        raise Http404
+    return fullpath
+
+
+def parse_range(header, size):
+    """Границы (start, end) одного диапазона из заголовка Range.
+
+    None — заголовок не поддерживается и отдаётся весь файл,
+    ValueError — диапазон не пересекается с файлом.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        if int(end) == 0:
+            raise ValueError(header)
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def read_range(fileobj, start, length, block_size=FileResponse.block_size):
+    with fileobj:
+        fileobj.seek(start)
+        while length > 0:
+            data = fileobj.read(min(block_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def serve_static(request, path):
+    """Файл из STATIC_ROOT со сжатием по Accept-Encoding.
+
+    Файлы с хэшем в имени кэшируются браузером навсегда.
+    """
+    fullpath = resolve_path(settings.STATIC_ROOT, path)
+    statobj = fullpath.stat()
+    if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'), statobj.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    served, encoding = fullpath, None
+    accepted = accepted_encodings(request)
+    for coding, suffix in PRECOMPRESSED:
+        variant = fullpath.with_name(fullpath.name + suffix)
+        if coding in accepted and variant.is_file():
+            served, encoding = variant, coding
+            break
+
+    response = FileResponse(
+        served.open('rb'),
+        content_type=content_type or 'application/octet-stream'
+    )
+    response['Last-Modified'] = http_date(statobj.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if HASHED_NAME_RE.search(fullpath.name):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    return response
+
+
+def serve_media(request, path):
+    """Загруженный файл из MEDIA_ROOT.
+
+    При MEDIA_ACCEL_REDIRECT отдачу выполняет фронтовый веб-сервер
+    (X-Sendfile или X-Accel-Redirect), иначе файл отдаётся через
+    FileResponse, для которого WSGI-сервер может использовать sendfile.
+    Поддерживаются If-Modified-Since и один диапазон в Range.
+    """
+    fullpath = resolve_path(settings.MEDIA_ROOT, path)
+    statobj = fullpath.stat()
+    last_modified = http_date(statobj.st_mtime)
+    if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'), statobj.st_mtime):
+        return HttpResponseNotModified()
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        if settings.MEDIA_ACCEL_REDIRECT == 'x-sendfile':
+            response['X-Sendfile'] = str(fullpath)
+        else:
+            name = posixpath.normpath(path).lstrip('/')
+            response['X-Accel-Redirect'] = (
+                settings.MEDIA_ACCEL_PREFIX + quote(name)
+            )
+        response['Last-Modified'] = last_modified
+        return response
+
+    size = statobj.st_size
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if 'HTTP_RANGE' in request.META and if_range in (None, last_modified):
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(fullpath.open('rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            read_range(fullpath.open('rb'), start, length),
+            status=206, content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    return response
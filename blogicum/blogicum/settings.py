@@ -1,5 +1,9 @@
+import os
+from datetime import timedelta
 from pathlib import Path
 
+from django.utils.functional import lazy
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,6 +34,75 @@ ALLOWED_HOSTS = [
 
 POSTS_PER_PAGE = 10
 
+# Общий для всех процессов кэш: в нём сессии (blog.sessions),
+# пользователи, отметки просмотров и результаты запросов. Кэш в памяти
+# процесса (LocMemCache) не годится — выход из аккаунта или сброс в одном
+# процессе не увидят остальные; у файлового add() не атомарен, а set()
+# обходит весь каталог. Рабочий вариант — memcached по адресу из
+# MEMCACHED_LOCATION, без него — таблица в БД (создаёт миграция blog).
+if os.environ.get('MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['MEMCACHED_LOCATION'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        },
+    }
+
+AUTH_USER_CACHE_TIMEOUT = 60 * 15
+
+PROFILE_CACHE_TIMEOUT = 60 * 60
+
+# QuerySet.cached(): срок жизни результата и шаг округления «сейчас»
+# в фильтрах по дате публикации.
+QUERYSET_CACHE_TIMEOUT = 60
+QUERYSET_CACHE_NOW_GRANULARITY = 60
+
+# Кэш горячих страниц (blog.pagecache): свежесть с разбросом ±10%,
+# сколько ещё отдавать устаревшую версию во время пересчёта и сколько
+# хранить последнюю удачную на случай недоступности БД.
+PAGE_CACHE_TTL = 30
+PAGE_CACHE_JITTER = 0.1
+PAGE_CACHE_STALE_TTL = 60 * 5
+PAGE_CACHE_LAST_GOOD_TTL = 60 * 60 * 24
+PAGE_CACHE_LOCK_TIMEOUT = 30
+PAGE_CACHE_LOCK_WAIT = 2
+
+# Шина сброса кэшей между процессами (blog.bus): период опроса
+# (None — не опрашивать, если процесс один), сколько секунд
+# перечитывать свежие события и с какой задержки предупреждать в логе.
+INVALIDATION_BUS_POLL_INTERVAL = 1
+INVALIDATION_BUS_GRACE = 10
+INVALIDATION_BUS_LAG_WARNING = 5
+INVALIDATION_BUS_RETENTION = 60 * 60
+
+# Массовые UPDATE и DELETE (blog.bulk) идут порциями по столько строк.
+BULK_CHUNK_SIZE = 1000
+# Сколько строк админка удаляет прямо в запросе, а не через
+# run_moderation_jobs.
+MODERATION_SYNC_LIMIT = 10000
+
+# Просмотры записываются в БД фоновым потоком пачкой раз в минуту
+# (None — поток не запускается); повтор в той же сессии в течение
+# получаса не считается.
+VIEW_COUNT_FLUSH_INTERVAL = 60
+VIEW_COUNT_DEDUP_WINDOW = 60 * 30
+
+# Блок «Популярно сейчас», пересчитывается командой compute_popular_posts.
+POPULAR_POSTS_TOP = 5
+POPULAR_POSTS_WINDOW_DAYS = 7
+POPULAR_POSTS_HALF_LIFE = timedelta(hours=24)
+
+# Cache-Control: public для анонимных GET без cookie; 0 — отключено.
+ANONYMOUS_CACHE_MAX_AGE = 0
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -46,14 +119,28 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'blog.middleware.InvalidationBusMiddleware',
+    'blog.middleware.MinifyCompressMiddleware',
+    'blog.middleware.AnonymousFastSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+MINIFY_HTML = True
+
+# Уровни сжатия ответов; подбираются по manage.py bench_compression.
+RESPONSE_COMPRESSION_LEVELS = {'gzip': 6, 'br': 5}
+
+SESSION_ENGINE = 'blog.sessions'
+
+# Неизменившаяся сессия пишется в БД не чаще раза в час.
+SESSION_WRITE_INTERVAL = 60 * 60
+
+SESSION_CLEAR_CHUNK_SIZE = 1000
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -126,8 +213,48 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'static_collected'
+# Без DEBUG статика берётся из collectstatic: с хэшами в именах и
+# предсжатыми .gz/.br копиями.
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'blogicum.storage.CompressedManifestStaticFilesStorage'
+    )
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
+# Изображения публикаций проверяются при потоковом чтении
+# (blog.uploads); запрос длиннее второго предела обрывается сразу.
+POST_IMAGE_MAX_SIZE = 5 * 1024 * 1024
+POST_UPLOAD_MAX_REQUEST_SIZE = POST_IMAGE_MAX_SIZE + 1024 * 1024
+# Загрузки хранятся под SHA-256 содержимого: post_images/ab/cd/<hash>.jpg.
+DEFAULT_FILE_STORAGE = 'blogicum.storage.ContentAddressedStorage'
+
+# Тексты публикаций и комментариев длиннее порога хранятся сжатыми zlib
+# (blog.fields.CompressedTextField); короткие — как есть.
+TEXT_COMPRESSION_MIN_SIZE = 512
+TEXT_COMPRESSION_LEVEL = 6
+
+# Передача отдачи медиафайлов веб-серверу: None, 'x-sendfile' (Apache,
+# lighttpd) или 'x-accel-redirect' (nginx, internal location по префиксу).
+MEDIA_ACCEL_REDIRECT = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+# Сборщик осиротевших медиафайлов (collect_orphaned_media) не трогает
+# файлы моложе суток; карантин лежит вне MEDIA_ROOT, чтобы его не
+# отдавал serve_media.
+MEDIA_GC_GRACE_PERIOD = 60 * 60 * 24
+MEDIA_GC_QUARANTINE = BASE_DIR / 'media_quarantine'
+
+
+def _static_url(path):
+    from django.templatetags.static import static
+    return static(path)
+
+
+# Bootstrap подключается из собственной статики, а не с CDN.
+BOOTSTRAP5 = {
+    'css_url': {'url': lazy(_static_url, str)('css/bootstrap.min.css')},
+}
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
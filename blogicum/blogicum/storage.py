@@ -0,0 +1,143 @@
+"""Хранилища файлов проекта.
+
+CompressedManifestStaticFilesStorage: кроме файлов с хэшем в имени
+collectstatic кладёт рядом с ними сжатые копии name.gz и, если
+установлен пакет brotli, name.br. Их отдаёт blogicum.serve.serve_static.
+
+ContentAddressedStorage: загрузки хранятся под именем из SHA-256
+содержимого в двухуровневых подкаталогах, одинаковые файлы — один раз.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+from .compression import compress_variants
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.json', '.xml', '.html',
+)
+# Файлы меньше этого размера сжатие почти не уменьшает.
+MIN_COMPRESS_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Промежуточные имена удаляются между проходами, поэтому сжимаются
+        # только итоговые файлы из манифеста.
+        for hashed_name in sorted(set(self.hashed_files.values())):
+            self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as source:
+            data = source.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in compress_variants(data):
+            with open(self.path(name + suffix), 'wb') as target:
+                target.write(compressed)
+
+
+CONTENT_ADDRESSED_NAME = re.compile(
+    r'(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[^/]*)?$'
+)
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_ADDRESSED_NAME.search(name))
+
+
+# Расширение короче этого и из латиницы с цифрами сохраняется, прочие
+# отбрасываются: имя должно помещаться в ImageField (100 символов).
+SAFE_EXTENSION = re.compile(r'\.[a-z0-9]{1,10}')
+
+
+def normalized_extension(original_name):
+    extension = os.path.splitext(original_name)[1].lower()
+    return extension if SAFE_EXTENSION.fullmatch(extension) else ''
+
+
+def content_addressed_name(directory, sha256, original_name):
+    extension = normalized_extension(original_name)
+    return posixpath.join(
+        directory, sha256[:2], sha256[2:4], sha256 + extension
+    )
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Имена вида post_images/ab/cd/<sha256>.jpg и дедупликация.
+
+    Хэш считается при потоковой записи во временный файл в целевом
+    каталоге (или берётся готовый из атрибута sha256 загрузки, см.
+    blog.uploads), затем файл атомарно переименовывается. Если файл
+    с таким хэшем уже есть, временный удаляется, а имя возвращается то
+    же: один файл может принадлежать нескольким строкам.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Имя определяется содержимым, совпадение означает тот же файл.
+        # Итоговая длина известна заранее: хэш всегда одной длины.
+        final_name = content_addressed_name(
+            posixpath.dirname(name), '0' * 64, name
+        )
+        if max_length is not None and len(final_name) > max_length:
+            raise SuspiciousFileOperation(
+                f'Имя {final_name!r} длиннее {max_length} символов.'
+            )
+        return name
+
+    def _reuse(self, target):
+        # Файл мог быть сиротой, которого вот-вот удалит сборщик
+        # (blog.media_gc): свежее время изменения продлевает ему жизнь.
+        os.utime(self.path(target))
+        return target
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        os.makedirs(self.path(directory or '.'), exist_ok=True)
+        digest = getattr(content, 'sha256', None)
+        if digest is not None:
+            # Хэш уже посчитан при загрузке (blog.uploads).
+            target = content_addressed_name(directory, digest, name)
+            if self.exists(target):
+                return self._reuse(target)
+        fd, temporary = tempfile.mkstemp(
+            prefix='.upload-', dir=self.path(directory or '.')
+        )
+        try:
+            sha256 = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as output:
+                content.seek(0)
+                for chunk in content.chunks():
+                    sha256.update(chunk)
+                    output.write(chunk)
+            target = content_addressed_name(
+                directory, sha256.hexdigest(), name
+            )
+            if self.exists(target):
+                os.remove(temporary)
+                return self._reuse(target)
+            os.makedirs(
+                os.path.dirname(self.path(target)), exist_ok=True
+            )
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary, self.file_permissions_mode)
+            os.replace(temporary, self.path(target))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return target
@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib import admin
 from django.views.generic.edit import CreateView
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.contrib.auth.forms import UserCreationForm
 
+from .serve import serve_media, serve_static
+
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.error_500'
 handler403 = 'pages.views.csrf_failure'
@@ -21,4 +24,12 @@ urlpatterns = [
         ),
         name='registration',
     ),
+    re_path(
+        r'^{}(?P<path>.*)$'.format(settings.STATIC_URL.lstrip('/')),
+        serve_static,
+    ),
+    re_path(
+        r'^{}(?P<path>.*)$'.format(settings.MEDIA_URL.lstrip('/')),
+        serve_media,
+    ),
 ]
@@ -31,7 +31,8 @@ def CommentModelAdapter(CommentModel: type) -> CommentModelAdapterT:
 
         @property
         def _access_by_name_fields(self):
-            return ["id", "refresh_from_db"]
+            # text — CompressedTextField: поиск по типу ищет TextField.
+            return ["id", "text", "refresh_from_db"]
 
         @property
         def AdapterFields(self) -> type:
@@ -28,14 +28,27 @@ class PostModelAdapter(StudentModelAdapter):
             "created_at",
             "is_published",
             "title",
-            "text",
             "pub_date",
             "author",
             "category",
             "location",
+            # Тот же тип, что у view_count: без имени поля проверка
+            # уникальности типов в StudentModelAdapter их не различит.
+            "word_count",
             "refresh_from_db",
         ]
 
+    @property
+    def text(self):
+        # Текст хранится в blog.models.PostBody, у Post это свойство,
+        # а не поле. Классу соответствует поле PostBody.text: у него то же
+        # имя, что у поля формы публикации.
+        if isclass(self._item_or_cls):
+            from blog.models import PostBody
+
+            return PostBody.text
+        return self._item_or_cls.text
+
     @property
     def AdapterFields(self) -> type:
         class _AdapterFields:
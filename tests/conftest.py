@@ -41,6 +41,46 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def discard_buffered_views(settings):
+    # Без фонового потока записи: тесты вызывают flush() явно.
+    settings.VIEW_COUNT_FLUSH_INTERVAL = None
+    from blog.counters import post_views
+    post_views.reset()
+    yield
+    post_views.reset()
+
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests',
+    },
+}
+
+
+@pytest.fixture(scope='session', autouse=True)
+def test_cache():
+    # Свой кэш на запуск тестов: cache.clear() в тестах не должен
+    # задевать кэш проекта.
+    with override_settings(CACHES=TEST_CACHES):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache(test_cache):
+    # Записи прошлых тестов ссылались бы на другие строки тестовой БД.
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def disable_invalidation_bus_polling(settings):
+    # Опрос шины добавлял бы запрос к случайным запросам тестов;
+    # тесты шины вызывают bus.poll() явно.
+    settings.INVALIDATION_BUS_POLL_INTERVAL = None
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -367,3 +407,12 @@ def cleanup(request):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
                     os.remove(file_path)
+
+    # Хранилище раскладывает файлы по подкаталогам хэша.
+    for root, dirs, files in os.walk(image_dir, topdown=False):
+        if (
+                Path(root) != image_dir
+                and not os.listdir(root)
+                and os.path.getmtime(root) >= start_time
+        ):
+            os.rmdir(root)
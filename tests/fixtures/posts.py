@@ -9,7 +9,7 @@ from django.db.models import Model
 from django.forms import BaseForm
 from django.test import Client
 from django.utils import timezone
-from mixer.backend.django import Mixer
+from mixer.backend.django import Mixer, mixer as _mixer
 
 from conftest import (
     N_PER_FIXTURE,
@@ -21,6 +21,15 @@ from conftest import (
 )
 
 
+@_mixer.middleware('blog.post')
+def _fill_post_text(post):
+    # Текст хранится в PostBody, Post.text — свойство, а не поле модели,
+    # поэтому mixer не генерирует его сам.
+    if post._pending_text is None:
+        post.text = _mixer.faker.text()
+    return post
+
+
 @pytest.fixture
 def posts_with_unpublished_category(mixer: Mixer, user: Model):
     return mixer.cycle(N_PER_FIXTURE).blend(
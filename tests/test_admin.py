@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def changelist_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(queries), response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model', ('post', 'comment'))
+def test_changelist_queries_do_not_grow_with_rows(
+        model, admin_client, mixer, comment_to_a_post
+):
+    url = reverse(f'admin:blog_{model}_changelist')
+    before, _ = changelist_queries(admin_client, url)
+    posts = mixer.cycle(5).blend('blog.Post')
+    for post in posts:
+        mixer.blend('blog.Comment', post=post)
+    after, _ = changelist_queries(admin_client, url)
+    assert after == before, (
+        "Убедитесь, что список в админке не делает запрос на каждую строку."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_filters_do_not_enumerate_related(
+        admin_client, comment_to_a_post
+):
+    url = reverse('admin:blog_comment_changelist')
+    _, response = changelist_queries(admin_client, url)
+    content = response.content.decode()
+    assert f'?author__id__exact={comment_to_a_post.author_id}' not in content
+    assert 'name="author_username"' in content, (
+        "Убедитесь, что фильтр по автору — поле ввода, а не список "
+        "всех пользователей."
+    )
+    _, response = changelist_queries(
+        admin_client,
+        f'{url}?author_username={comment_to_a_post.author.username}'
+    )
+    assert list(response.context['cl'].result_list) == [comment_to_a_post]
+
+
+@pytest.mark.django_db
+def test_comment_search_by_author_and_post(admin_client, comment_to_a_post):
+    url = reverse('admin:blog_comment_changelist')
+    for term in (
+        comment_to_a_post.author.username,
+        comment_to_a_post.post.title.split()[0],
+    ):
+        _, response = changelist_queries(admin_client, f'{url}?q={term}')
+        assert comment_to_a_post in response.context['cl'].result_list, (
+            "Убедитесь, что комментарии ищутся по автору и публикации."
+        )
+    messages = [str(message) for message in response.context['messages']]
+    assert any('короче' in message for message in messages), (
+        "Убедитесь, что при поиске комментариев админ видит, что "
+        "длинные тексты по тексту не находятся."
+    )
+
+
+@pytest.mark.django_db
+def test_post_search_by_text_start(admin_client, post_with_published_location):
+    post = post_with_published_location
+    post.text = 'Уникальное начало текста публикации'
+    post.save()
+    url = reverse('admin:blog_post_changelist')
+    _, response = changelist_queries(admin_client, f'{url}?q=Уникальное')
+    assert post in response.context['cl'].result_list, (
+        "Убедитесь, что публикации ищутся по тексту."
+    )
@@ -0,0 +1,29 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ('blog:index', 'pages:about'))
+def test_anonymous_read_has_no_vary_cookie(client, url_name):
+    response = client.get(reverse(url_name))
+    assert 'Cookie' not in response.get('Vary', ''), (
+        "Убедитесь, что анонимные GET-запросы без сессионной cookie "
+        "не помечаются заголовком `Vary: Cookie`."
+    )
+    assert not response.cookies
+
+
+@pytest.mark.django_db
+def test_authenticated_read_varies_on_cookie(user_client):
+    response = user_client.get(reverse('blog:index'))
+    assert 'Cookie' in response.get('Vary', '')
+
+
+@pytest.mark.django_db
+@override_settings(ANONYMOUS_CACHE_MAX_AGE=60)
+def test_anonymous_read_is_publicly_cacheable(client, user_client):
+    response = client.get(reverse('pages:about'))
+    assert 'public' in response['Cache-Control']
+    response = user_client.get(reverse('pages:about'))
+    assert not response.has_header('Cache-Control')
@@ -0,0 +1,104 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
+
+from blog import bulk
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    (tmp_path / 'post_images').mkdir()
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+def wait_for_file_cleanup():
+    bulk._file_cleanup.submit(lambda: None).result()
+
+
+@pytest.mark.django_db
+def test_delete_user_cascades_in_chunks(
+        settings, mixer, user, another_user, published_category
+):
+    settings.BULK_CHUNK_SIZE = 2
+    posts = mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category
+    )
+    mixer.cycle(5).blend('blog.Comment', post=posts[0], author=another_user)
+    foreign_post = mixer.blend('blog.Post', author=another_user)
+    mixer.cycle(3).blend('blog.Comment', post=foreign_post, author=user)
+
+    bulk.delete_ids(get_user_model(), [user.pk])
+
+    assert not get_user_model().objects.filter(pk=user.pk).exists()
+    assert not Post.objects.filter(author_id=user.pk).exists()
+    assert not Comment.objects.filter(post_id=posts[0].pk).exists()
+    assert not Comment.objects.filter(author_id=user.pk).exists()
+    assert Post.objects.filter(pk=foreign_post.pk).exists(), (
+        "Убедитесь, что быстрое удаление не затрагивает чужие публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_post_delete_view_removes_image_after_commit(
+        user_client, comment_to_a_post, media_root,
+        django_capture_on_commit_callbacks
+):
+    post = comment_to_a_post.post
+    image = media_root / 'post_images' / 'pic.jpg'
+    image.write_bytes(b'image')
+    Post.objects.filter(pk=post.pk).update(image='post_images/pic.jpg')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(reverse('blog:delete_post', kwargs={'pk': post.pk}))
+    wait_for_file_cleanup()
+
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(pk=comment_to_a_post.pk).exists()
+    assert not image.exists(), (
+        "Убедитесь, что изображение удалённой публикации стирается."
+    )
+
+
+@pytest.mark.django_db
+def test_delete_updates_commented_author_profile(
+        client, user, another_user, post_with_published_location, mixer
+):
+    mixer.blend(
+        'blog.Comment', post=post_with_published_location,
+        author=another_user
+    )
+    url = reverse('blog:profile', kwargs={'username': user.username})
+    assert client.get(url).context['summary']['comment_count'] == 1
+    bulk.delete_ids(get_user_model(), [another_user.pk])
+    assert client.get(url).context['summary']['comment_count'] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_interrupted_delete_keeps_committed_chunks(
+        settings, mixer, user, published_category, monkeypatch
+):
+    settings.BULK_CHUNK_SIZE = 2
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    execute_delete = bulk._execute_delete
+
+    def fail_on_posts(model, ids):
+        if model is Post:
+            raise DatabaseError('соединение потеряно')
+        return execute_delete(model, ids)
+
+    monkeypatch.setattr(bulk, '_execute_delete', fail_on_posts)
+    with pytest.raises(DatabaseError):
+        bulk.delete_ids(get_user_model(), [user.pk])
+    assert not Comment.objects.filter(post=post).exists(), (
+        "Убедитесь, что каждая порция удаления фиксируется отдельно."
+    )
+    assert Post.objects.filter(pk=post.pk).exists()
+
+    monkeypatch.undo()
+    bulk.delete_ids(get_user_model(), [user.pk])
+    assert not get_user_model().objects.filter(pk=user.pk).exists()
@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+
+from blog.fields import COMPRESSED_PREFIX
+from blog.models import Comment, PostBody
+from blog.rendering import render_text
+
+
+def raw_text(model, pk, column='text'):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {column} FROM {model._meta.db_table} '
+            f'WHERE {model._meta.pk.column} = %s', [pk]
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_long_text_stored_compressed(post_with_published_location):
+    post = post_with_published_location
+    post.text = 'Длинный текст публикации. ' * 200
+    post.save()
+    assert raw_text(PostBody, post.pk).startswith(COMPRESSED_PREFIX), (
+        "Убедитесь, что длинный текст публикации хранится сжатым."
+    )
+    assert raw_text(PostBody, post.pk, 'html').startswith(
+        COMPRESSED_PREFIX
+    ), "Убедитесь, что HTML длинного текста хранится сжатым."
+    body = PostBody.objects.get(pk=post.pk)
+    assert body.text == post.text
+    assert body.html == render_text(post.text)
+
+
+@pytest.mark.django_db
+def test_short_comment_stored_plain(comment_to_a_post):
+    comment_to_a_post.text = 'Короткий'
+    comment_to_a_post.save()
+    assert raw_text(Comment, comment_to_a_post.pk) == 'Короткий'
+    assert Comment.objects.filter(text__icontains='оротк').exists()
+
+
+@pytest.mark.django_db
+def test_legacy_plain_text_readable(comment_to_a_post):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE blog_comment SET text = %s WHERE id = %s',
+            ['Записан до сжатия', comment_to_a_post.pk]
+        )
+    comment_to_a_post.refresh_from_db()
+    assert comment_to_a_post.text == 'Записан до сжатия'
+
+
+@pytest.mark.django_db
+def test_text_starting_with_prefix_round_trips(comment_to_a_post):
+    comment_to_a_post.text = COMPRESSED_PREFIX + 'не сжатый'
+    comment_to_a_post.save()
+    comment_to_a_post.refresh_from_db()
+    assert comment_to_a_post.text == COMPRESSED_PREFIX + 'не сжатый'
+
+
+@pytest.mark.django_db
+def test_lookup_values_are_not_compressed(comment_to_a_post):
+    text = 'слово ' * 100
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE blog_comment SET text = %s WHERE id = %s',
+            [text, comment_to_a_post.pk]
+        )
+    assert Comment.objects.filter(text__icontains=text[:540]).exists(), (
+        "Убедитесь, что параметры поиска по сжимаемому полю не сжимаются."
+    )
+    assert Comment.objects.filter(text=text).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_update_stores_compressed(comment_to_a_post):
+    comment_to_a_post.text = 'Длинный комментарий. ' * 100
+    Comment.objects.bulk_update([comment_to_a_post], ['text'])
+    assert raw_text(Comment, comment_to_a_post.pk).startswith(
+        COMPRESSED_PREFIX
+    )
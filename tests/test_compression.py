@@ -0,0 +1,84 @@
+import gzip
+
+import pytest
+from django.urls import reverse
+
+from blogicum.compression import (
+    compress_sequence, minify_html, minify_html_sequence
+)
+
+HTML = (
+    '<div>\n    <p>Текст   с  пробелами</p>\n\n  </div>\n'
+    '<pre>  код\n    с отступами</pre>\n'
+    '<TEXTAREA name="text">  сохраняем\n\n  всё</TEXTAREA>   <b>x</b>'
+)
+
+
+def test_minify_preserves_preformatted():
+    minified = minify_html(HTML)
+    assert '<p>Текст с пробелами</p>' in minified
+    assert '<pre>  код\n    с отступами</pre>' in minified
+    assert '<TEXTAREA name="text">  сохраняем\n\n  всё</TEXTAREA>' in minified
+    assert '</TEXTAREA> <b>x</b>' in minified
+
+
+@pytest.mark.parametrize('size', (1, 2, 3, 7, 16))
+def test_streaming_minify_matches_whole(size):
+    data = HTML.encode()
+    chunks = (data[i:i + size] for i in range(0, len(data), size))
+    streamed = b''.join(minify_html_sequence(chunks, 'utf-8'))
+    assert streamed.decode() == minify_html(HTML)
+
+
+ATTRIBUTES_HTML = (
+    '<input  type="text"\n  value="два  пробела \'>\' "> текст  '
+    '<!-- комментарий  > -->  <p title=\'a   b\'>x</p>'
+)
+
+
+def test_minify_keeps_tags_as_is():
+    assert minify_html(ATTRIBUTES_HTML) == (
+        '<input type="text"\nvalue="два  пробела \'>\' "> текст '
+        '<!-- комментарий  > --> <p title=\'a   b\'>x</p>'
+    )
+
+
+@pytest.mark.parametrize('size', (1, 2, 5, 11))
+def test_streaming_minify_keeps_tags(size):
+    data = ATTRIBUTES_HTML.encode()
+    chunks = (data[i:i + size] for i in range(0, len(data), size))
+    streamed = b''.join(minify_html_sequence(chunks, 'utf-8'))
+    assert streamed.decode() == minify_html(ATTRIBUTES_HTML)
+
+
+@pytest.mark.django_db
+def test_edit_form_keeps_spaces_in_title(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.title = 'Заголовок  с   пробелами'
+    post.save()
+    response = user_client.get(
+        reverse('blog:edit_post', kwargs={'post_id': post.id})
+    )
+    assert 'value="Заголовок  с   пробелами"' in response.content.decode(), (
+        "Убедитесь, что минификация не меняет значения полей формы."
+    )
+
+
+def test_streaming_gzip_roundtrip():
+    chunks = [b'<p>chunk</p>' * 50 for _ in range(5)]
+    compressed = b''.join(compress_sequence(iter(chunks), 'gzip', 6))
+    assert gzip.decompress(compressed) == b''.join(chunks)
+
+
+@pytest.mark.django_db
+def test_index_is_minified_and_compressed(client, mixer):
+    mixer.cycle(5).blend('blog.Post', category__is_published=True)
+    plain = client.get(reverse('blog:index'))
+    assert b'\n    ' not in plain.content
+    response = client.get(
+        reverse('blog:index'), HTTP_ACCEPT_ENCODING='gzip'
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.content) == plain.content
@@ -0,0 +1,103 @@
+import pytest
+from django.core.cache import cache
+
+from blog.bus import InvalidationBus
+from blog.dimensions import categories
+from blog.models import InvalidationEvent, Post
+from blog.querycache import table_versions
+
+
+@pytest.fixture
+def other_process():
+    """Шина «другого процесса» со своим origin и подписчиками."""
+    other = InvalidationBus()
+    received = []
+    other.subscribe('dimension')(received.append)
+    other.poll()
+    return other, received
+
+
+@pytest.mark.django_db
+def test_events_written_after_commit(
+        published_category, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        published_category.title = 'Новое название'
+        published_category.save()
+    assert InvalidationEvent.objects.filter(
+        topic='dimension', key='blog.category'
+    ).exists(), (
+        "Убедитесь, что изменение категории публикуется в шину "
+        "сброса кэшей."
+    )
+
+
+@pytest.mark.django_db
+def test_other_process_applies_event(
+        other_process, published_category, django_capture_on_commit_callbacks
+):
+    other, received = other_process
+    with django_capture_on_commit_callbacks(execute=True):
+        published_category.save()
+    assert other.poll() >= 1
+    assert received == ['blog.category']
+    assert other.metrics['last_lag'] is not None
+    # Повторный опрос не применяет событие ещё раз.
+    other.poll()
+    assert received == ['blog.category']
+
+
+@pytest.mark.django_db
+def test_own_events_are_not_reapplied(
+        published_category, django_capture_on_commit_callbacks
+):
+    from blog.bus import bus
+    bus.poll()
+    version = categories.current_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        published_category.save()
+    changed = categories.current_version()
+    assert changed != version
+    bus.poll()
+    assert categories.current_version() == changed
+
+
+@pytest.mark.django_db
+def test_table_event_invalidates_local_cache(other_process):
+    other, _ = other_process
+    other.subscribe('table')(lambda table: cache.delete(f'seen:{table}'))
+    cache.set('seen:blog_post', True)
+    InvalidationEvent.objects.create(
+        topic='table', key='blog_post', origin='worker-2'
+    )
+    other.poll()
+    assert cache.get('seen:blog_post') is None
+
+
+@pytest.mark.django_db
+def test_shared_cache_reset_once_without_events(
+        post_with_published_location, django_capture_on_commit_callbacks
+):
+    version = table_versions([Post._meta.db_table])
+    with django_capture_on_commit_callbacks(execute=True):
+        post_with_published_location.save()
+    assert table_versions([Post._meta.db_table]) != version
+    assert not InvalidationEvent.objects.exists(), (
+        "Убедитесь, что сброс общего кэша не записывается в шину: "
+        "его достаточно выполнить в одном процессе."
+    )
+
+
+@pytest.mark.django_db
+def test_other_process_only_forgets_dimension_map(
+        other_process, published_category, django_capture_on_commit_callbacks
+):
+    other, _ = other_process
+    bumps = []
+    other.subscribe('dimension', shared=True)(bumps.append)
+    with django_capture_on_commit_callbacks(execute=True):
+        published_category.save()
+    other.poll()
+    assert bumps == [], (
+        "Убедитесь, что другие процессы не сбрасывают общий кэш повторно."
+    )
@@ -0,0 +1,51 @@
+import os
+import time
+
+import pytest
+from django.test import override_settings
+
+from blog.media_gc import collect
+from blog.models import Post
+
+OLD = time.time() - 2 * 24 * 60 * 60
+
+
+@pytest.fixture
+def media_root(tmp_path, post_with_published_location):
+    images = tmp_path / 'media' / 'post_images'
+    images.mkdir(parents=True)
+    for name in ('used.jpg', 'orphan.jpg', 'fresh.jpg'):
+        (images / name).write_bytes(b'x' * 100)
+    for name in ('used.jpg', 'orphan.jpg'):
+        os.utime(images / name, (OLD, OLD))
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        image='post_images/used.jpg'
+    )
+    with override_settings(
+            MEDIA_ROOT=tmp_path / 'media',
+            MEDIA_GC_QUARANTINE=tmp_path / 'quarantine'):
+        yield tmp_path
+
+
+@pytest.mark.django_db
+def test_collect_deletes_only_old_orphans(media_root):
+    report = collect()
+    images = media_root / 'media' / 'post_images'
+    assert sorted(os.listdir(images)) == ['fresh.jpg', 'used.jpg'], (
+        "Убедитесь, что удаляются только файлы без ссылок старше "
+        "периода ожидания."
+    )
+    assert report.scanned == 3
+    assert report.orphans == 1
+    assert report.reclaimed_bytes == 100
+
+
+@pytest.mark.django_db
+def test_collect_quarantine_and_dry_run(media_root):
+    collect(dry_run=True)
+    assert (media_root / 'media' / 'post_images' / 'orphan.jpg').exists()
+    collect(quarantine=True)
+    assert (media_root / 'quarantine' / 'post_images' / 'orphan.jpg').exists()
+    assert not (
+        media_root / 'media' / 'post_images' / 'orphan.jpg'
+    ).exists()
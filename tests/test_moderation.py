@@ -0,0 +1,72 @@
+import pytest
+from django.urls import reverse
+
+from blog.models import Comment, ModerationJob, Post, PostBody
+from blog.moderation import run_pending_jobs
+
+
+def run_action(client, model, action, objects):
+    return client.post(reverse(f'admin:blog_{model}_changelist'), {
+        'action': action,
+        '_selected_action': [obj.pk for obj in objects],
+    })
+
+
+@pytest.mark.django_db
+def test_bulk_unpublish_reaches_cached_feed(
+        admin_client, client, many_posts_with_published_locations
+):
+    url = reverse('blog:index')
+    assert client.get(url).context['paginator'].count > 0
+    run_action(
+        admin_client, 'post', 'bulk_unpublish',
+        many_posts_with_published_locations
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    assert client.get(url).context['paginator'].count == 0, (
+        "Убедитесь, что массовое снятие с публикации сбрасывает кэш ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_delete_post_cascades_to_comments(
+        admin_client, comment_to_a_post, django_assert_max_num_queries
+):
+    post = comment_to_a_post.post
+    # Число запросов зависит от числа таблиц и порций, а не от строк.
+    with django_assert_max_num_queries(23):
+        run_action(admin_client, 'post', 'bulk_delete', [post])
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(pk=comment_to_a_post.pk).exists()
+    assert not PostBody.objects.filter(post_id=post.pk).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_delete_category_keeps_posts(
+        admin_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    run_action(admin_client, 'category', 'bulk_delete', [category])
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.category is None
+
+
+@pytest.mark.django_db
+def test_large_delete_is_queued(
+        settings, admin_client, many_posts_with_published_locations
+):
+    settings.MODERATION_SYNC_LIMIT = 5
+    settings.BULK_CHUNK_SIZE = 8
+    run_action(
+        admin_client, 'post', 'bulk_delete',
+        many_posts_with_published_locations
+    )
+    assert ModerationJob.objects.count() == 3
+    assert Post.objects.count() == len(many_posts_with_published_locations)
+    assert not Post.objects.filter(is_published=True).exists(), (
+        "Убедитесь, что поставленные в очередь публикации сразу "
+        "снимаются с публикации."
+    )
+    assert run_pending_jobs() == len(many_posts_with_published_locations)
+    assert not Post.objects.exists()
+    assert not ModerationJob.objects.exists()
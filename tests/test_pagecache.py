@@ -0,0 +1,137 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import OperationalError
+from django.test import Client
+from django.urls import reverse
+
+from blog import pagecache
+from blog.models import PageCacheLock
+from blog.pagecache import acquire_lock, get_or_refresh
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def expire_in(backend, key):
+    entry = backend.get(key)
+    entry['fresh_until'] = time.time() - 1
+    backend.set(key, entry)
+
+
+def expire(key):
+    expire_in(cache, key)
+
+
+def failing():
+    raise OperationalError('database is unavailable')
+
+
+def test_fresh_value_is_not_recomputed():
+    get_or_refresh('page:test', lambda: 'первое')
+    assert get_or_refresh('page:test', lambda: 'второе') == 'первое'
+
+
+def test_version_change_triggers_refresh():
+    get_or_refresh('page:test', lambda: 'первое', versions=(1,))
+    assert get_or_refresh(
+        'page:test', lambda: 'второе', versions=(2,)
+    ) == 'второе'
+
+
+def test_stale_value_served_while_refresh_in_progress():
+    get_or_refresh('page:test', lambda: 'первое')
+    expire('page:test')
+    acquire_lock('page:test')
+    assert get_or_refresh('page:test', lambda: 'второе') == 'первое', (
+        "Убедитесь, что пока другой процесс пересчитывает страницу, "
+        "отдаётся устаревшая версия."
+    )
+
+
+def test_last_good_value_served_when_database_is_down():
+    get_or_refresh('page:test', lambda: 'первое')
+    expire('page:test')
+    assert get_or_refresh('page:test', failing) == 'первое', (
+        "Убедитесь, что при недоступной БД отдаётся последняя удачная "
+        "версия страницы."
+    )
+    assert not PageCacheLock.objects.exists()
+
+
+def test_lock_shared_between_process_caches(monkeypatch):
+    # Два отдельных кэша — как LocMemCache двух процессов.
+    first = LocMemCache('first-process', {})
+    second = LocMemCache('second-process', {})
+    monkeypatch.setattr(pagecache, 'cache', second)
+    get_or_refresh('page:test', lambda: 'первое')
+    expire_in(second, 'page:test')
+    computed = []
+
+    def refresh_in_first_process():
+        # Пока первый процесс пересчитывает, страницу просит второй.
+        monkeypatch.setattr(pagecache, 'cache', second)
+        computed.append(get_or_refresh(
+            'page:test', lambda: computed.append('второй') or 'второе'
+        ))
+        return 'новое'
+
+    monkeypatch.setattr(pagecache, 'cache', first)
+    assert get_or_refresh('page:test', refresh_in_first_process) == 'новое'
+    assert computed == ['первое'], (
+        "Убедитесь, что страницу пересчитывает только один процесс, "
+        "даже если у процессов разные кэши."
+    )
+
+
+def test_database_error_without_saved_value_propagates():
+    with pytest.raises(OperationalError):
+        get_or_refresh('page:test', failing)
+
+
+@pytest.mark.django_db
+def test_index_served_from_page_cache(
+        client, many_posts_with_published_locations
+):
+    url = reverse('blog:index')
+    first = client.get(url)
+    second = client.get(url)
+    assert second.context is None, (
+        "Убедитесь, что главная страница для анонимных посетителей "
+        "отдаётся из кэша без повторного рендеринга."
+    )
+    assert second.content == first.content
+
+
+@pytest.mark.django_db
+def test_query_string_does_not_split_page_cache(
+        client, many_posts_with_published_locations
+):
+    url = reverse('blog:index')
+    client.get(url)
+    for query in ('?utm_source=mail', '?x=1', '?page=1'):
+        assert client.get(url + query).context is None, (
+            "Убедитесь, что параметры запроса, кроме номера страницы, "
+            "не создают отдельных записей в кэше страниц."
+        )
+    assert client.get(url + '?page=2').context is not None
+
+
+@pytest.mark.django_db
+def test_login_keeps_index_page_cache(
+        client, user, many_posts_with_published_locations
+):
+    url = reverse('blog:index')
+    client.get(url)
+    Client().force_login(user)
+    assert client.get(url).context is None, (
+        "Убедитесь, что вход пользователя не сбрасывает кэш главной."
+    )
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import PopularPost
+from blog.popularity import (
+    compute_scores, rebuild_popular_posts, top_per_group
+)
+
+HOUR = 3600.0
+
+
+def test_scores_decay_with_age():
+    scores = compute_scores(
+        view_counts=np.array([10.0, 10.0]),
+        post_ages=np.array([0.0, 24 * HOUR]),
+        comment_post_index=np.array([1, 1]),
+        comment_ages=np.array([0.0, 0.0]),
+        half_life=24 * HOUR,
+    )
+    assert scores[0] == pytest.approx(10.0)
+    assert scores[1] == pytest.approx(5.0 + 20.0)
+
+
+def test_top_per_group():
+    scores = np.array([1.0, 5.0, 3.0, 4.0, 2.0])
+    groups = np.array([1, 1, 2, 1, 2])
+    keep, ranks = top_per_group(scores, groups, top=2)
+    assert list(zip(keep, ranks)) == [(1, 0), (3, 1), (2, 0), (4, 1)]
+
+
+@pytest.mark.django_db
+def test_popular_block_on_index(client, mixer, published_category):
+    now = timezone.now()
+    quiet, hot = mixer.cycle(2).blend(
+        'blog.Post', category=published_category,
+        pub_date=now - timedelta(hours=1),
+    )
+    mixer.cycle(3).blend('blog.Comment', post=hot)
+    rebuild_popular_posts()
+    overall = list(PopularPost.objects.for_category())
+    assert [item.post_id for item in overall] == [hot.id, quiet.id]
+    response = client.get(reverse('blog:index'))
+    assert list(response.context['popular_posts']) == overall
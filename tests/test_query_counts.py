@@ -0,0 +1,246 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from blog.models import Post
+
+# Сессия читается из кэша, пользователь при холодном кэше — из БД.
+AUTH_QUERIES = 1
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_post_detail_single_query(
+        user_client, post_with_published_location, comment_to_a_post,
+        django_assert_num_queries
+):
+    url = reverse(
+        'blog:post_detail',
+        kwargs={'post_id': post_with_published_location.id}
+    )
+    # Публикация вместе с автором, категорией и локацией + комментарии.
+    with django_assert_num_queries(AUTH_QUERIES + 2):
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что автор может открыть страницу своей публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_hidden_from_another_user(
+        another_user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    url = reverse(
+        'blog:post_detail',
+        kwargs={'post_id': post_with_published_location.id}
+    )
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = another_user_client.get(url)
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что снятая с публикации запись недоступна "
+        "другим пользователям."
+    )
+
+
+@pytest.mark.django_db
+def test_post_edit_resolves_object_once(
+        user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    url = reverse(
+        'blog:edit_post',
+        kwargs={'post_id': post_with_published_location.id}
+    )
+    # Публикация + варианты выбора категории и локации в форме.
+    with django_assert_num_queries(AUTH_QUERIES + 3):
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что автор может открыть страницу редактирования поста."
+    )
+
+
+@pytest.mark.django_db
+def test_post_edit_redirects_not_author(
+        another_user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    url = reverse(
+        'blog:edit_post',
+        kwargs={'post_id': post_with_published_location.id}
+    )
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = another_user_client.get(url)
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что пользователь, не являющийся автором, "
+        "перенаправляется со страницы редактирования поста."
+    )
+
+
+@pytest.mark.django_db
+def test_post_delete_resolves_object_once(
+        user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    url = reverse(
+        'blog:delete_post',
+        kwargs={'pk': post_with_published_location.id}
+    )
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ('blog:edit_comment', 'blog:delete_comment'))
+def test_comment_views_resolve_object_once(
+        url_name, client, comment_to_a_post, django_assert_num_queries
+):
+    client.force_login(comment_to_a_post.author)
+    pk_kwarg = 'pk' if url_name == 'blog:edit_comment' else 'comment_id'
+    url = reverse(url_name, kwargs={
+        'post_id': comment_to_a_post.post_id,
+        pk_kwarg: comment_to_a_post.id,
+    })
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_warm_user_cache_skips_user_query(
+        user_client, django_assert_num_queries
+):
+    url = reverse('pages:about')
+    user_client.get(url)
+    with django_assert_num_queries(AUTH_QUERIES - 1):
+        response = user_client.get(url)
+    assert response.context['user'].is_authenticated
+
+
+@pytest.mark.django_db
+def test_profile_edit_invalidates_user_cache(user, user_client):
+    user_client.get(reverse('pages:about'))
+    user_client.post(reverse('blog:edit_profile'), data={
+        'first_name': 'Новое имя',
+        'last_name': user.last_name,
+        'username': user.username,
+        'email': 'new@example.com',
+    })
+    response = user_client.get(reverse('pages:about'))
+    assert response.context['user'].first_name == 'Новое имя', (
+        "Убедитесь, что после редактирования профиля "
+        "данные пользователя не берутся из устаревшего кэша."
+    )
+
+
+@pytest.mark.django_db
+def test_password_change_invalidates_user_cache(user, user_client):
+    user_client.get(reverse('pages:about'))
+    user.set_password('n3w-Passw0rd!')
+    user.save()
+    response = user_client.get(reverse('pages:about'))
+    assert not response.context['user'].is_authenticated, (
+        "Убедитесь, что после смены пароля старые сессии "
+        "не аутентифицируются по кэшу."
+    )
+
+
+@pytest.mark.django_db
+def test_warm_index_does_not_query_db(
+        client, many_posts_with_published_locations,
+        django_assert_num_queries
+):
+    url = reverse('blog:index')
+    client.get(url)
+    # Страница, число публикаций и блок популярных берутся из кэша
+    # querysets, категории и локации — из памяти процесса.
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_new_comment_invalidates_cached_feed(
+        client, user_client, post_with_published_location
+):
+    url = reverse('blog:index')
+    client.get(url)
+    user_client.post(
+        reverse(
+            'blog:add_comment',
+            kwargs={'post_id': post_with_published_location.id}
+        ),
+        data={'text': 'Комментарий'}
+    )
+    post = client.get(url).context['page_obj'][0]
+    assert post.comment_count == 1, (
+        "Убедитесь, что новый комментарий сразу учитывается в ленте."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_update_invalidates_cached_feed(
+        client, many_posts_with_published_locations
+):
+    url = reverse('blog:index')
+    assert client.get(url).context['paginator'].count == len(
+        many_posts_with_published_locations
+    )
+    Post.objects.update(is_published=False)
+    assert client.get(url).context['paginator'].count == 0
+
+
+@pytest.mark.django_db
+def test_category_change_reaches_feed(
+        client, many_posts_with_published_locations, published_category
+):
+    url = reverse('blog:index')
+    client.get(url)
+    published_category.title = 'Новое название'
+    published_category.save()
+    assert 'Новое название' in client.get(url).content.decode(), (
+        "Убедитесь, что изменение категории сразу видно в ленте."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_page_costs_one_query_when_warm(
+        client, user, many_posts_with_published_locations,
+        django_assert_num_queries
+):
+    url = reverse('blog:profile', kwargs={'username': user.username})
+    client.get(url)
+    with django_assert_num_queries(1):
+        response = client.get(url, {'page': 2})
+    assert response.context['paginator'].count == len(
+        many_posts_with_published_locations
+    )
+
+
+@pytest.mark.django_db
+def test_profile_summary_follows_comments(
+        client, user, post_with_published_location, another_user_client
+):
+    url = reverse('blog:profile', kwargs={'username': user.username})
+    assert client.get(url).context['summary']['comment_count'] == 0
+    another_user_client.post(
+        reverse(
+            'blog:add_comment',
+            kwargs={'post_id': post_with_published_location.id}
+        ),
+        data={'text': 'Комментарий'}
+    )
+    summary = client.get(url).context['summary']
+    assert summary['comment_count'] == 1
+    assert summary['post_count'] == 1
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.querycache import cacheable_now
+
+
+def feed():
+    return list(Post.objects.published(now=cacheable_now()).cached())
+
+
+@pytest.mark.django_db
+def test_scheduled_post_not_shown_early(
+        settings, post_with_published_location
+):
+    settings.QUERYSET_CACHE_NOW_GRANULARITY = 3600
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(seconds=5)
+    post.save()
+    assert post not in feed(), (
+        "Убедитесь, что отложенная публикация не появляется в ленте "
+        "раньше своей даты."
+    )
+
+
+@pytest.mark.django_db
+def test_cached_feed_key_stable_within_step(
+        settings, post_with_published_location, django_assert_num_queries
+):
+    settings.QUERYSET_CACHE_NOW_GRANULARITY = 3600
+    assert post_with_published_location in feed()
+    with django_assert_num_queries(0):
+        feed()
@@ -0,0 +1,78 @@
+from io import StringIO
+from importlib import import_module
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from blog.models import PostBody
+from blog.rendering import RENDERER_VERSION
+
+
+@pytest.mark.django_db
+def test_html_rendered_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = 'Первая строка\n<script>'
+    post.save()
+    body = PostBody.objects.get(post=post)
+    assert body.renderer_version == RENDERER_VERSION
+    assert body.html == 'Первая строка<br>&lt;script&gt;'
+
+
+@pytest.mark.django_db
+def test_detail_uses_stored_html(user_client, post_with_published_location):
+    post = post_with_published_location
+    PostBody.objects.filter(post=post).update(html='<b>сохранённый</b>')
+    response = user_client.get(
+        reverse('blog:post_detail', kwargs={'post_id': post.id})
+    )
+    assert '<b>сохранённый</b>' in response.content.decode(), (
+        "Убедитесь, что страница публикации выводит сохранённый HTML текста."
+    )
+
+
+@pytest.mark.django_db
+def test_stale_html_rendered_and_rebuilt(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    PostBody.objects.filter(post=post).update(
+        html='устаревший', renderer_version=0
+    )
+    response = user_client.get(
+        reverse('blog:post_detail', kwargs={'post_id': post.id})
+    )
+    content = response.content.decode()
+    assert post.text.split()[0] in content
+    assert 'устаревший' not in content, (
+        "Убедитесь, что HTML старой версии рендера не выводится."
+    )
+    call_command('rerender_post_bodies', stdout=StringIO())
+    body = PostBody.objects.get(post=post)
+    assert body.renderer_version == RENDERER_VERSION
+    assert body.html != 'устаревший'
+
+
+@pytest.mark.django_db
+def test_rerender_keeps_concurrent_edit(
+        monkeypatch, post_with_published_location
+):
+    post = post_with_published_location
+    PostBody.objects.filter(post=post).update(renderer_version=0)
+    rerender = import_module('blog.management.commands.rerender_post_bodies')
+    render_text = rerender.render_text
+
+    def render_during_edit(text):
+        # Публикацию редактируют, пока команда строит HTML.
+        post.text = 'Новый текст'
+        post.save()
+        return render_text(text)
+
+    monkeypatch.setattr(rerender, 'render_text', render_during_edit)
+    call_command('rerender_post_bodies', stdout=StringIO())
+    body = PostBody.objects.get(post=post)
+    assert body.text == 'Новый текст'
+    assert body.html == 'Новый текст', (
+        "Убедитесь, что rerender_post_bodies не перезаписывает HTML "
+        "текста, изменённого во время работы команды."
+    )
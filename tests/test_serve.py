@@ -0,0 +1,83 @@
+import gzip
+
+import pytest
+from django.test import override_settings
+
+HASHED_NAME = 'app.0123456789ab.css'
+CSS = b'body { margin: 0; }\n' * 100
+
+
+@pytest.fixture
+def static_root(tmp_path):
+    (tmp_path / HASHED_NAME).write_bytes(CSS)
+    (tmp_path / (HASHED_NAME + '.gz')).write_bytes(gzip.compress(CSS))
+    (tmp_path / 'app.css').write_bytes(CSS)
+    with override_settings(STATIC_ROOT=tmp_path):
+        yield tmp_path
+
+
+@pytest.mark.django_db
+def test_static_gzip_negotiation(client, static_root):
+    response = client.get(
+        f'/static/{HASHED_NAME}', HTTP_ACCEPT_ENCODING='gzip, deflate'
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'] == 'text/css'
+    assert gzip.decompress(b''.join(response.streaming_content)) == CSS
+    assert 'Accept-Encoding' in response['Vary']
+
+    response = client.get(f'/static/{HASHED_NAME}')
+    assert not response.has_header('Content-Encoding')
+    assert b''.join(response.streaming_content) == CSS
+
+
+@pytest.mark.django_db
+def test_static_immutable_only_for_hashed_names(client, static_root):
+    response = client.get(f'/static/{HASHED_NAME}')
+    assert 'immutable' in response['Cache-Control']
+    response = client.get('/static/app.css')
+    assert not response.has_header('Cache-Control')
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    (tmp_path / 'post_images').mkdir()
+    (tmp_path / 'post_images' / 'pic.jpg').write_bytes(bytes(range(256)))
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+@pytest.mark.django_db
+def test_media_range_request(client, media_root):
+    response = client.get(
+        '/media/post_images/pic.jpg', HTTP_RANGE='bytes=10-19'
+    )
+    assert response.status_code == 206
+    assert response['Content-Range'] == 'bytes 10-19/256'
+    assert b''.join(response.streaming_content) == bytes(range(10, 20))
+
+    response = client.get(
+        '/media/post_images/pic.jpg', HTTP_RANGE='bytes=300-'
+    )
+    assert response.status_code == 416
+
+
+@pytest.mark.django_db
+def test_media_not_modified(client, media_root):
+    response = client.get('/media/post_images/pic.jpg')
+    assert response.status_code == 200
+    response = client.get(
+        '/media/post_images/pic.jpg',
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+@override_settings(MEDIA_ACCEL_REDIRECT='x-accel-redirect')
+def test_media_accel_redirect(client, media_root):
+    response = client.get('/media/post_images/pic.jpg')
+    assert response['X-Accel-Redirect'] == (
+        '/protected-media/post_images/pic.jpg'
+    )
+    assert response.content == b''
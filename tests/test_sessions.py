@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.sessions import SessionStore
+from blogicum import settings as project_settings
+
+
+@pytest.fixture
+def saved_session():
+    session = SessionStore()
+    session['key'] = 'value'
+    session.save()
+    return session
+
+
+@pytest.mark.django_db
+def test_unchanged_session_is_not_written(
+        saved_session, django_assert_num_queries
+):
+    session = SessionStore(saved_session.session_key)
+    session['key'] = 'value'
+    with django_assert_num_queries(0):
+        session.save()
+
+
+@pytest.mark.django_db
+def test_changed_session_is_written(saved_session):
+    session = SessionStore(saved_session.session_key)
+    session['key'] = 'other'
+    session.save()
+    cache.clear()
+    assert SessionStore(saved_session.session_key)['key'] == 'other'
+
+
+@pytest.mark.django_db
+@override_settings(SESSION_WRITE_INTERVAL=0)
+def test_unchanged_session_expiry_is_refreshed(saved_session):
+    session = SessionStore(saved_session.session_key)
+    session.load()
+    with CaptureQueriesContext(connection) as queries:
+        session.save()
+    assert any(
+        query['sql'].startswith('UPDATE') for query in queries
+    )
+
+
+@pytest.mark.django_db
+@override_settings(SESSION_CLEAR_CHUNK_SIZE=2)
+def test_clear_expired_in_chunks(saved_session):
+    Session.objects.bulk_create(
+        Session(
+            session_key=f'expired{i}',
+            session_data='',
+            expire_date=timezone.now() - timedelta(days=1),
+        )
+        for i in range(5)
+    )
+    SessionStore.clear_expired()
+    assert list(
+        Session.objects.values_list('session_key', flat=True)
+    ) == [saved_session.session_key]
+
+
+def test_session_cache_shared_between_processes(settings):
+    # Тесты работают с кэшем в памяти, проверяется настройка проекта.
+    backend = project_settings.CACHES[settings.SESSION_CACHE_ALIAS]
+    assert backend['BACKEND'] not in (
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.filebased.FileBasedCache',
+    ), (
+        "Убедитесь, что кэш сессий общий для всех процессов и атомарно "
+        "выполняет add(): не в памяти одного процесса и не в файлах."
+    )
@@ -0,0 +1,74 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from blog.models import Post
+from blogicum.storage import ContentAddressedStorage, is_content_addressed
+
+
+@pytest.fixture
+def storage(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield ContentAddressedStorage()
+
+
+def test_identical_uploads_are_stored_once(storage, tmp_path):
+    first = storage.save('post_images/a.JPG', ContentFile(b'image'))
+    second = storage.save('post_images/b.jpg', ContentFile(b'image'))
+    other = storage.save('post_images/c.jpg', ContentFile(b'other'))
+    assert first == second, (
+        "Убедитесь, что одинаковые загрузки сохраняются одним файлом."
+    )
+    assert first != other
+    assert is_content_addressed(first)
+    assert first.startswith('post_images/') and first.endswith('.jpg')
+    files = [path for path in tmp_path.rglob('*') if path.is_file()]
+    assert len(files) == 2
+
+
+def test_duplicate_upload_refreshes_mtime(storage, tmp_path):
+    name = storage.save('post_images/a.jpg', ContentFile(b'image'))
+    os.utime(tmp_path / name, (0, 0))
+    storage.save('post_images/b.jpg', ContentFile(b'image'))
+    assert (tmp_path / name).stat().st_mtime > 0, (
+        "Убедитесь, что повторная загрузка обновляет время изменения "
+        "файла, чтобы сборщик медиафайлов не удалил его."
+    )
+
+
+def test_name_fits_image_field(storage):
+    max_length = Post._meta.get_field('image').max_length
+    name = storage.save(
+        'post_images/a.' + 'x' * 40, ContentFile(b'image'),
+        max_length=max_length,
+    )
+    assert len(name) <= max_length, (
+        "Убедитесь, что длинное расширение не делает имя файла длиннее "
+        "поля изображения."
+    )
+    assert is_content_addressed(name)
+    with pytest.raises(SuspiciousFileOperation):
+        storage.save(
+            'x' * 40 + '/a.jpg', ContentFile(b'image'),
+            max_length=max_length,
+        )
+
+
+@pytest.mark.django_db
+def test_migrate_media_layout(storage, tmp_path, post_with_published_location):
+    (tmp_path / 'post_images').mkdir(exist_ok=True)
+    (tmp_path / 'post_images' / 'old.jpg').write_bytes(b'image')
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        image='post_images/old.jpg'
+    )
+    call_command('migrate_media_layout', stdout=StringIO())
+    post_with_published_location.refresh_from_db()
+    name = post_with_published_location.image.name
+    assert is_content_addressed(name)
+    assert (tmp_path / name).read_bytes() == b'image'
+    assert not (tmp_path / 'post_images' / 'old.jpg').exists()
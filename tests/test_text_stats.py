@@ -0,0 +1,132 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post, PostBody
+
+
+@pytest.mark.django_db
+def test_text_stats_computed_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = ' '.join(['слово'] * 450)
+    post.save(update_fields=['text'])
+    post.refresh_from_db()
+    assert post.word_count == 450
+    assert post.reading_time == 3
+    assert post.excerpt == ' '.join(['слово'] * 10) + ' …'
+
+
+@pytest.mark.django_db
+def test_feed_does_not_load_text(client, many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('blog:index'))
+    assert response.context['page_obj'][0].excerpt
+    assert not any(
+        'blog_postbody' in query['sql']
+        for query in queries.captured_queries
+    ), "Убедитесь, что лента не загружает полный текст публикаций."
+
+
+@pytest.mark.django_db
+def test_text_stored_in_post_body(post_with_published_location):
+    post = post_with_published_location
+    post.text = 'Новый текст'
+    post.save()
+    assert PostBody.objects.get(post=post).text == 'Новый текст'
+    post = Post.objects.with_body().get(pk=post.pk)
+    assert post.text == 'Новый текст'
+
+
+@pytest.mark.django_db
+def test_post_and_body_saved_together(
+        monkeypatch, post_with_published_location
+):
+    post = post_with_published_location
+    title = post.title
+
+    def fail(*args, **kwargs):
+        raise DatabaseError
+
+    monkeypatch.setattr(PostBody, 'save', fail)
+    post.title = 'Новый заголовок'
+    post.text = 'Новый текст'
+    with pytest.raises(DatabaseError):
+        post.save()
+    assert Post.objects.get(pk=post.pk).title == title, (
+        "Убедитесь, что публикация и её текст сохраняются в одной "
+        "транзакции."
+    )
+
+
+@pytest.mark.django_db
+def test_refresh_discards_unsaved_text(post_with_published_location):
+    post = post_with_published_location
+    text = PostBody.objects.get(post=post).text
+    post.text = 'Несохранённый текст'
+    post.refresh_from_db()
+    assert post.text == text, (
+        "Убедитесь, что refresh_from_db() сбрасывает несохранённый текст."
+    )
+    PostBody.objects.filter(post=post).update(text='Изменённый текст')
+    post.refresh_from_db(fields=['text'])
+    assert post.text == 'Изменённый текст'
+
+
+@pytest.mark.django_db
+def test_backfill_command(post_with_published_location):
+    Post.objects.update(excerpt='', word_count=0, reading_time=0)
+    call_command('backfill_post_text_stats', stdout=StringIO())
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.word_count == len(
+        post_with_published_location.text.split()
+    )
+    assert post_with_published_location.excerpt
+
+
+@pytest.mark.django_db
+def test_unchanged_text_not_rewritten(post_with_published_location):
+    post = Post.objects.with_body().get(pk=post_with_published_location.pk)
+    post.text = post.text
+    post.title = 'Новый заголовок'
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    assert not any(
+        'blog_postbody' in query['sql']
+        for query in queries.captured_queries
+    ), "Убедитесь, что неизменённый текст публикации не записывается заново."
+
+
+@pytest.mark.django_db
+def test_deleted_post_is_reinserted_on_save(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).delete()
+    post.title = 'Восстановленная'
+    post.save()
+    assert Post.objects.filter(pk=post.pk, title='Восстановленная').exists(), (
+        "Убедитесь, что сохранение удалённой публикации вставляет строку "
+        "заново, как обычно в Django."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_create_does_not_drop_text(user, published_category):
+    post = Post(
+        author=user, category=published_category, title='Заголовок',
+        pub_date=timezone.now()
+    )
+    post.text = 'Текст'
+    if connection.features.can_return_rows_from_bulk_insert:
+        Post.objects.bulk_create([post])
+        assert PostBody.objects.get(post=post).text == 'Текст'
+    else:
+        with pytest.raises(ValueError):
+            Post.objects.bulk_create([post])
+        assert not Post.objects.exists(), (
+            "Убедитесь, что bulk_create() не создаёт публикации без "
+            "присвоенного им текста."
+        )
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from blog.models import Post
+from blogicum.storage import is_content_addressed
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+def jpeg():
+    data = BytesIO()
+    Image.new('RGB', (10, 10)).save(data, 'JPEG')
+    return data.getvalue()
+
+
+def create_post(client, category, content):
+    return client.post(reverse('blog:create_post'), {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': '2020-01-01T00:00',
+        'category': category.pk,
+        'is_published': True,
+        'image': SimpleUploadedFile('pic.jpg', content, 'image/jpeg'),
+    })
+
+
+@pytest.mark.django_db
+def test_valid_image_is_stored_by_hash(user_client, published_category):
+    response = create_post(user_client, published_category, jpeg())
+    assert response.status_code == HTTPStatus.FOUND
+    assert is_content_addressed(Post.objects.get().image.name)
+
+
+@pytest.mark.django_db
+def test_bogus_image_rejected_by_signature(user_client, published_category):
+    response = create_post(
+        user_client, published_category, b'<?php echo 1; ?>' * 10
+    )
+    assert not Post.objects.exists()
+    assert 'image' in response.context['form'].errors, (
+        "Убедитесь, что файл с неизвестной сигнатурой отклоняется "
+        "с ошибкой в поле изображения."
+    )
+
+
+@pytest.mark.django_db
+def test_oversized_image_rejected_while_streaming(
+        settings, user_client, published_category
+):
+    settings.POST_IMAGE_MAX_SIZE = 100
+    response = create_post(
+        user_client, published_category, jpeg() + b'\0' * 1000
+    )
+    assert not Post.objects.exists()
+    assert 'image' in response.context['form'].errors
+
+
+@pytest.mark.django_db
+def test_upload_views_still_check_csrf(user, published_category):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = create_post(client, published_category, jpeg())
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_oversized_request_gets_413(
+        settings, user_client, published_category
+):
+    settings.POST_UPLOAD_MAX_REQUEST_SIZE = 1000
+    response = create_post(
+        user_client, published_category, jpeg() + b'\0' * 1000
+    )
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE, (
+        "Убедитесь, что слишком длинный запрос получает ответ 413, "
+        "а не ошибку сервера."
+    )
+    assert not Post.objects.exists()
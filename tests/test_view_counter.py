@@ -0,0 +1,81 @@
+import pytest
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.urls import reverse
+
+from blog.counters import ViewCounter, post_views
+from blog.models import Post
+from blog.querycache import table_versions
+
+
+@pytest.mark.django_db
+def test_repeated_view_in_session_counted_once(
+        user_client, another_user_client, post_with_published_location
+):
+    url = reverse(
+        'blog:post_detail',
+        kwargs={'post_id': post_with_published_location.id}
+    )
+    user_client.get(url)
+    user_client.get(url)
+    response = another_user_client.get(url)
+    assert response.context['view_count'] == 2, (
+        "Убедитесь, что повторный просмотр в той же сессии не учитывается."
+    )
+
+
+@pytest.mark.django_db
+def test_flush_is_one_update(mixer, django_assert_num_queries):
+    posts = mixer.cycle(3).blend('blog.Post')
+    counter = ViewCounter()
+    for post in posts:
+        for _ in range(post.id % 3 + 1):
+            counter.record(post.id, None)
+    with django_assert_num_queries(1):
+        counter.flush()
+    for post in posts:
+        post.refresh_from_db()
+        assert post.view_count == post.id % 3 + 1
+
+
+@pytest.mark.django_db
+def test_failed_flush_keeps_views(post_with_published_location, monkeypatch):
+    counter = ViewCounter()
+    counter.record(post_with_published_location.id, None)
+
+    def fail(*args, **kwargs):
+        raise DatabaseError('БД недоступна')
+
+    monkeypatch.setattr(QuerySet, 'update', fail)
+    with pytest.raises(DatabaseError):
+        counter.flush()
+    monkeypatch.undo()
+    assert counter.pending(post_with_published_location.id) == 1
+    counter.flush()
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.view_count == 1
+
+
+@pytest.mark.django_db
+def test_post_edit_keeps_flushed_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post_views.record(post.id, None)
+    post_views.flush()
+    post.title = 'Новый заголовок'
+    post.save()
+    post.refresh_from_db()
+    assert post.view_count == 1, (
+        "Убедитесь, что сохранение публикации не затирает просмотры."
+    )
+
+
+@pytest.mark.django_db
+def test_flush_keeps_cached_querysets(post_with_published_location):
+    version = table_versions([Post._meta.db_table])
+    post_views.record(post_with_published_location.id, None)
+    post_views.flush()
+    assert table_versions([Post._meta.db_table]) == version, (
+        "Убедитесь, что запись просмотров не сбрасывает кэш публикаций."
+    )